@@ -3,9 +3,10 @@
 
 from __future__ import unicode_literals, absolute_import
 
-from .icalendar import Calendar
+from .icalendar import Calendar, load_many
 from .event import Event
 from .todo import Todo
+from .freebusy import FreeBusy
 from .__meta__ import (
     __title__,
     __version__,
@@ -7,37 +7,67 @@ from six import PY2, PY3, StringIO, string_types, text_type, integer_types
 from six.moves import filter, map, range
 
 from collections import namedtuple
-
-from .utils import get_lines
+import itertools
+import weakref
 
 
 Extractor = namedtuple(
     'Extractor',
-    ['function', 'type', 'required', 'multiple']
+    ['function', 'type', 'required', 'multiple', 'lazy_attrs']
 )
 
+# Bookkeeping attributes of a lazily populated component
+_LAZY_STATE = ('_raw', '_deferred', '_lazy_defaults', '_pristine')
+
+# Versions given to the lists whose components changed (next() is atomic)
+_versions = itertools.count(1)
+
 
 class Component(object):
     _TYPE = "ABSTRACT"
 
     @classmethod
     def _from_container(cls, container, *args, **kwargs):
+        """Instanciates a component from a Container.
+
+        If the `lazy` keyword argument is True, the extractors declaring
+        `lazy_attrs` are only run when one of those attributes is read.
+        """
         if cls._TYPE == "ABSTRACT":
             raise NotImplementedError('Abstract class, cannot instanciate.')
 
+        lazy = kwargs.pop('lazy', False)
         k = cls()
         k._classmethod_args = args
         k._classmethod_kwargs = kwargs
-        k._populate(container)
+        k._populate(container, lazy=lazy)
 
         return k
 
-    def _populate(self, container):
+    def _populate(self, container, lazy=False):
         if container.name != self._TYPE:
             raise ValueError("container isn't an {}".format(self._TYPE))
 
-        for extractor in self._EXTRACTORS:
-            lines = get_lines(container, extractor.type)
+        # Dispatch every line to its extractor in a single pass.
+        # Lines are bucketed from the end, like utils.get_lines() does.
+        types = self._extracted_types()
+        buckets, unused = {}, []
+        for item in reversed(container):
+            if item.name in types:
+                buckets.setdefault(item.name, []).append(item)
+            else:
+                unused.append(item)
+        unused.reverse()
+        if lazy:
+            # Keep the raw lines untouched to serialize them back as is
+            self._raw = container
+            container = container.__class__(container.name, *unused)
+            deferred, defaults = {}, {}
+        else:
+            container[:] = unused
+
+        for index, extractor in enumerate(self._EXTRACTORS):
+            lines = buckets.pop(extractor.type, [])
             if not lines and extractor.required:
                 raise ValueError(
                     'A {} must have at least one {}'
@@ -48,7 +78,12 @@ class Component(object):
                     'A {} must have at most one {}'
                     .format(container.name, extractor.type))
 
-            if extractor.multiple:
+            if lazy and lines and extractor.lazy_attrs:
+                # Remove the attributes to be called back by __getattr__
+                for attr in extractor.lazy_attrs:
+                    defaults[attr] = self.__dict__.pop(attr, None)
+                deferred[index] = lines if extractor.multiple else lines[0]
+            elif extractor.multiple:
                 extractor.function(self, lines)  # Send a list or empty list
             else:
                 if len(lines) == 1:
@@ -57,16 +92,158 @@ class Component(object):
                     extractor.function(self, None)  # Send None
 
         self._unused = container  # Store unused lines
+        if lazy:
+            self._deferred = deferred
+            self._lazy_defaults = defaults
+            self._pristine = dict(
+                (k, v) for k, v in self.__dict__.items()
+                if k not in _LAZY_STATE)
+
+    def __getattr__(self, name):
+        # Only called for missing attributes: in lazy mode, they may be
+        # set by an extractor which did not run yet
+        deferred = self.__dict__.get('_deferred')
+        if deferred:
+            index = self._lazy_attributes().get(name)
+            if index in deferred:
+                self._run_deferred(index)
+                return self.__dict__[name]
+        raise AttributeError("'{}' object has no attribute '{}'"
+                             .format(self.__class__.__name__, name))
+
+    def _run_deferred(self, index):
+        """Runs the deferred extractors up to `index` (included).
+
+        Extractors run in the same order and see the same attributes as
+        in eager mode: the attributes of the extractors which did not
+        run yet keep their default value meanwhile.
+        """
+        deferred, defaults = self._deferred, self._lazy_defaults
+        extractors = self._EXTRACTORS
+        # New dicts rather than updates: clones may share the old ones
+        self._deferred = dict((i, arg) for i, arg in deferred.items()
+                              if i > index)
+        pristine = dict(self._pristine)
+
+        to_run, temporary = [], []
+        for i in sorted(deferred):
+            attrs = extractors[i].lazy_attrs
+            # Do not override attributes already set by the user
+            if i <= index and not any(a in self.__dict__ for a in attrs):
+                to_run.append(i)
+            for attr in attrs:
+                if attr not in self.__dict__:
+                    self.__dict__[attr] = defaults[attr]
+                    if i > index:
+                        temporary.append(attr)
+
+        # Running an extractor does not change self for the lists
+        lists = self.__dict__.pop('_lists', None)
+        try:
+            for i in to_run:
+                extractors[i].function(self, deferred[i])
+                for attr in extractors[i].lazy_attrs:
+                    pristine[attr] = self.__dict__.get(attr)
+        finally:
+            if lists is not None:
+                self.__dict__['_lists'] = lists
+
+        for attr in temporary:
+            if self.__dict__.get(attr) is defaults[attr]:
+                del self.__dict__[attr]
+        self._pristine = pristine
+
+    def _watch(self, container):
+        """Registers `container` (an EventList or a TodoList) as a list
+        containing self, so that _changed() outdates its indexes.
+
+        Lists are weakly referenced and never unregistered: a list from
+        which self was removed is only notified for nothing.
+        """
+        refs = self.__dict__.get('_lists')
+        if refs is None:
+            refs = self.__dict__['_lists'] = []
+        for ref in refs:
+            if ref() is container:
+                return
+        refs[:] = [ref for ref in refs if ref() is not None]
+        refs.append(weakref.ref(container))
+
+    def _changed(self, attr):
+        """Gives a new version `attr` (like '_times_version') to the
+        lists containing self: lets their indexes know that they are
+        outdated."""
+        refs = self.__dict__.get('_lists')
+        if refs:
+            version = next(_versions)
+            for ref in list(refs):
+                container = ref()
+                if container is not None:
+                    setattr(container, attr, version)
+
+    def __getstate__(self):
+        # Copies and pickles of self are not in the lists containing self
+        state = self.__dict__.copy()
+        state.pop('_lists', None)
+        return state
+
+    def _is_pristine(self):
+        """Returns True if self was populated lazily and none of its
+        attributes was changed since (changes made in place to mutable
+        values are not detected)."""
+        pristine = self.__dict__.get('_pristine')
+        if pristine is None:
+            return False
+        for attr, index in self._lazy_attributes().items():
+            if index in self._deferred and attr in self.__dict__:
+                return False
+        missing = object()
+        return all(self.__dict__.get(k, missing) is v
+                   for k, v in pristine.items())
+
+    @classmethod
+    def _extracted_types(cls):
+        """Returns the set of line names handled by the extractors of cls.
+
+        Computed once per class and reset when an extractor is registered.
+        """
+        types = cls.__dict__.get('_EXTRACTED_TYPES')
+        if types is None:
+            types = frozenset(extractor.type for extractor in cls._EXTRACTORS)
+            cls._EXTRACTED_TYPES = types
+        return types
+
+    @classmethod
+    def _lazy_attributes(cls):
+        """Returns a dict: attribute -> index of the extractor setting it,
+        for the extractors which may be deferred."""
+        attributes = cls.__dict__.get('_LAZY_ATTRIBUTES')
+        if attributes is None:
+            attributes = {}
+            for index, extractor in enumerate(cls._EXTRACTORS):
+                for attr in extractor.lazy_attrs:
+                    attributes[attr] = index
+            cls._LAZY_ATTRIBUTES = attributes
+        return attributes
 
     @classmethod
-    def _extracts(cls, line_type, required=False, multiple=False):
+    def _extracts(cls, line_type, required=False, multiple=False,
+                  lazy_attrs=()):
+        """Registers an extractor for the lines named `line_type`.
+
+        `lazy_attrs` are the names of the attributes set by the extractor.
+        If given, the extractor may be deferred until one of them is read.
+        """
         def decorator(fn):
             extractor = Extractor(
                 function=fn,
                 type=line_type,
                 required=required,
-                multiple=multiple)
+                multiple=multiple,
+                lazy_attrs=tuple(lazy_attrs))
             cls._EXTRACTORS.append(extractor)
+            cls._EXTRACTED_TYPES = None
+            cls._LAZY_ATTRIBUTES = None
             return fn
         return decorator
 
@@ -86,9 +263,19 @@ class Component(object):
             adress = hex(id(self))
             return '<{} at {}>'.format(t, adress)
 
-    def __str__(self):
-        """Returns the component in an iCalendar format."""
+    def _to_container(self):
+        """Returns a Container with the unused lines and the outputs.
+
+        An untouched lazy component returns its raw Container, which
+        must not be modified.
+        """
+        if self._is_pristine():
+            return self._raw
         container = self._unused.clone()
         for output in self._OUTPUTS:
             output(self, container)
-        return str(container)
+        return container
+
+    def __str__(self):
+        """Returns the component in an iCalendar format."""
+        return str(self._to_container())
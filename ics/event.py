@@ -10,6 +10,11 @@ import arrow
 import copy
 from datetime import timedelta
 
+try:
+    import numpy
+except ImportError:  # Only needed by EventList.expand_array()
+    numpy = None
+
 from .component import Component
 from .utils import (
     parse_duration,
@@ -19,14 +24,37 @@ from .utils import (
     get_arrow,
     arrow_to_iso,
     uid_gen,
+    compact_arrow,
+    epoch_to_timestamp,
+    naive_to_epoch,
+    arrow_to_epoch,
 )
 from .parse import ContentLine, Container
+from .recurrence import (
+    parse_rrule,
+    iter_recurrence,
+    is_finite,
+    expand_window,
+    recurrence_array,
+)
 
 # TODO: GLS: # https://tools.ietf.org/html/rfc5545#page-56
 # TODO: GLS: fail gracefully when parsing errors for incoming file
 import sys
 
 
+# Length of an event which has no end, for each precision of its beginning
+_PRECISION_MICROSECONDS = {
+    'second': 1000000,
+    'minute': 60 * 1000000,
+    'day': 86400 * 1000000,
+}
+
+
+def _microseconds(delta):
+    return (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds
+
+
 class Event(Component):
 
     """A calendar event.
@@ -40,6 +68,11 @@ class Event(Component):
     _EXTRACTORS = []
     _OUTPUTS = []
 
+    # Instants are stored compactly and converted to Arrow on access
+    _begin = compact_arrow('_begin')
+    _end_time = compact_arrow('_end_time')
+    created = compact_arrow('_created')
+
     def __init__(self,
                  name=None,
                  begin=None,
@@ -73,6 +106,9 @@ class Event(Component):
         self.description = description
         self.created = get_arrow(created)
         self.location = location
+        self._rrules = ()
+        self._rdates = ()
+        self._exdates = ()
         self._unused = Container(name='VEVENT')
 
         self.name = name
@@ -87,12 +123,22 @@ class Event(Component):
         elif duration:  # Duration was specified
             self.duration = duration
 
+    @property
+    def uid(self):
+        """Get or set the unique identifier of the event."""
+        return self._uid
+
+    @uid.setter
+    def uid(self, value):
+        self._uid = value
+        self._changed('_uid_version')
+
     def has_end(self):
         """
         Return:
             bool: self has an end
         """
-        return bool(self._end_time or self._duration)
+        return self._end_time_epoch is not None or bool(self._duration)
 
     @property
     def begin(self):
@@ -112,6 +158,7 @@ class Event(Component):
             raise ValueError('Begin must be before end')
         self._begin = value
         self._begin_precision = 'second'
+        self._changed('_times_version')
 
     @property
     def end(self):
@@ -129,9 +176,9 @@ class Event(Component):
         if self._duration:  # if end is duration defined
             # return the beginning + duration
             return self.begin + self._duration
-        elif self._end_time:  # if end is time defined
+        elif self._end_time_epoch is not None:  # if end is time defined
             return self._end_time
-        elif self._begin:  # if end is not defined
+        elif self._begin_epoch is not None:  # if end is not defined
             # return beginning + precision
             return self.begin.replace(**{self._begin_precision + 's': +1})
         else:
@@ -146,6 +193,7 @@ class Event(Component):
         self._end_time = value
         if value:
             self._duration = None
+        self._changed('_times_version')
 
     @property
     def duration(self):
@@ -177,6 +225,7 @@ class Event(Component):
             self._end_time = None
 
         self._duration = value
+        self._changed('_times_version')
 
     @property
     def all_day(self):
@@ -195,6 +244,163 @@ class Event(Component):
         self._begin = self._begin.floor('day')
         self._duration = None
         self._end_time = None
+        self._changed('_times_version')
+
+    def _epochs(self):
+        """Returns the (begin, begin_tz, end, end_tz) wall times of self
+        (see utils.arrow_to_epoch()), or None if self has no beginning."""
+        begin, begin_tz = self._begin_epoch, self._begin_tz
+        if begin is None:
+            return None
+        if self._duration:
+            # Like Arrow + timedelta, the duration is added to the wall time
+            return begin, begin_tz, \
+                begin + _microseconds(self._duration), begin_tz
+        elif self._end_time_epoch is not None:
+            return begin, begin_tz, self._end_time_epoch, self._end_time_tz
+        else:
+            return begin, begin_tz, \
+                begin + _PRECISION_MICROSECONDS[self._begin_precision], begin_tz
+
+    def _timestamps(self):
+        """Returns the (begin, end) timestamps of self, or None if self has
+        no beginning, without building Arrow objects.
+
+        Same values as (self.begin.float_timestamp, self.end.float_timestamp)
+        """
+        epochs = self._epochs()
+        if epochs is None:
+            return None
+        return (epoch_to_timestamp(epochs[0], epochs[1]),
+                epoch_to_timestamp(epochs[2], epochs[3]))
+
+    def is_recurring(self):
+        """
+        Return:
+            bool: self has a RRULE or a RDATE
+        """
+        return bool(self._rrules or self._rdates)
+
+    def occurrences(self, start=None, stop=None):
+        """Yields the occurrences of self which overlap [start, stop],
+        sorted by beginning.
+
+        The recurrence (RRULE, RDATE and EXDATE) is expanded lazily: an
+        unbounded series can be iterated until the caller stops. Bounded
+        windows are cached (see ics.recurrence.expand_window()).
+        Each occurrence of a recurring event is a new
+        :class:`ics.event.Event` with the uid of self.
+        A non-recurring event yields itself.
+
+        Args:
+            start (Arrow-convertible): lower bound or None
+            stop (Arrow-convertible): upper bound or None
+
+        Raises:
+            ValueError: if a RRULE is invalid
+        """
+        timestamps = self._timestamps()
+        if timestamps is None:
+            return
+        start_arrow, stop_arrow = get_arrow(start), get_arrow(stop)
+        start = None if start is None else start_arrow.float_timestamp
+        stop = None if stop is None else stop_arrow.float_timestamp
+
+        if not self.is_recurring():
+            if (start is None or timestamps[1] >= start) and \
+                    (stop is None or timestamps[0] <= stop):
+                yield self
+            return
+
+        tzinfo = self._begin_tz
+        length = self._length()
+        for dt in self._walls(start_arrow, stop_arrow, length):
+            begin = naive_to_epoch(dt)
+            if stop is not None and epoch_to_timestamp(begin, tzinfo) > stop:
+                break
+            if start is not None and \
+                    epoch_to_timestamp(begin + length, tzinfo) < start:
+                continue
+            yield self._occurrence(begin, length)
+
+    def _length(self):
+        """Returns the length of self in microseconds, to be added to the
+        wall time of its beginning (like Arrow + timedelta)."""
+        if self._duration:
+            return _microseconds(self._duration)
+        elif self._end_time_epoch is not None:
+            return _microseconds(self._end_time - self._begin)
+        else:
+            return _PRECISION_MICROSECONDS[self._begin_precision]
+
+    def _window(self, start, stop, length):
+        """Returns the bounds of the wall times of the occurrences of self
+        which may overlap [start, stop] (Arrow or None)."""
+        # A day of margin for the changes of offset
+        tzinfo = self._begin_tz
+        lo = hi = None
+        if start is not None:
+            lo = start.to(tzinfo).naive - \
+                timedelta(days=1, microseconds=length)
+        if stop is not None:
+            hi = stop.to(tzinfo).naive + timedelta(days=1)
+        return lo, hi
+
+    def _walls(self, start, stop, length):
+        """Yields the naive wall times of the occurrences of self which
+        may overlap [start, stop] (Arrow or None), and a few more."""
+        tzinfo = self._begin_tz
+        dtstart = self._begin.naive
+        rdates = tuple(instant.to(tzinfo).naive for instant in self._rdates)
+        exdates = tuple(instant.to(tzinfo).naive for instant in self._exdates)
+
+        def factory():
+            rules = [parse_rrule(value, dtstart, tzinfo)
+                     for value in self._rrules]
+            return iter_recurrence(dtstart, rules, rdates, exdates)
+
+        if stop is None and not is_finite(self._rrules):
+            return factory()  # Can not be cached
+        lo, hi = self._window(start, stop, length)
+        key = (self._begin_epoch, id(tzinfo), self._rrules, rdates, exdates)
+        return expand_window(key, factory, lo, hi, tzinfo)
+
+    def _walls_array(self, start, stop, length):
+        """Same as _walls() in a numpy array of wall times (see
+        arrow_to_epoch()). The recurrence is expanded by
+        ics.recurrence.recurrence_array() if its rules are simple.
+
+        Raises:
+            ValueError: if `stop` is None and the recurrence is infinite
+        """
+        if stop is None and not is_finite(self._rrules):
+            raise ValueError(
+                'The infinite recurrence of {} can not be expanded \
+without an upper bound'.format(self))
+        tzinfo = self._begin_tz
+        hi = self._window(start, stop, length)[1]
+        walls = recurrence_array(
+            self._begin_epoch, self._rrules, tzinfo,
+            [arrow_to_epoch(instant.to(tzinfo))[0] for instant in self._rdates],
+            [arrow_to_epoch(instant.to(tzinfo))[0]
+             for instant in self._exdates],
+            None if hi is None else naive_to_epoch(hi))
+        if walls is None:
+            walls = numpy.array(
+                [naive_to_epoch(dt) for dt in self._walls(start, stop, length)],
+                dtype=numpy.int64)
+        return walls
+
+    def _occurrence(self, begin, length):
+        """Returns a non-recurring copy of self beginning at `begin`
+        (see arrow_to_epoch()) and lasting `length` microseconds."""
+        occurrence = self.clone()
+        occurrence._rrules = occurrence._rdates = occurrence._exdates = ()
+        occurrence._begin_epoch = begin
+        if occurrence._end_time_epoch is not None:
+            occurrence._end_time_epoch = begin + length
+            occurrence._end_time_tz = self._begin_tz
+        return occurrence
 
     def __urepr__(self):
         """Should not be used directly. Use self.__repr__ instead.
@@ -266,14 +472,15 @@ class Event(Component):
         """
         Returns:
             int: hash of self. Based on self.uid."""
-        ord3 = lambda x: '%.3d' % ord(x)
-        return int(''.join(map(ord3, self.uid)))
+        # Strings cache their hash: it is computed once per uid value
+        return hash(self.uid)
 
 
 ######################
 ####### Inputs #######
 
-@Event._extracts('DTSTAMP')
+@Event._extracts('DTSTAMP',
+                 lazy_attrs=('_created_epoch', '_created_tz'))
 def created(event, line):
     if line:
         # get the dict of vtimezones passed to the classmethod
@@ -281,7 +488,8 @@ def created(event, line):
         event.created = iso_to_arrow(line, tz_dict)
 
 
-@Event._extracts('DTSTART')
+@Event._extracts('DTSTART', lazy_attrs=('_begin_epoch', '_begin_tz',
+                                        '_begin_precision'))
 def start(event, line):
     if line:
         # get the dict of vtimezones passed to the classmethod
@@ -328,7 +536,7 @@ def start(event, line):
 #arrow.parser.ParserError: Could not match input to any of ['YYYY-MM-DDTHH:mm']
 
 
-@Event._extracts('DURATION')
+@Event._extracts('DURATION', lazy_attrs=('_duration',))
 def duration(event, line):
     if line:
         #TODO: DRY [1]
@@ -337,7 +545,8 @@ def duration(event, line):
         event._duration = parse_duration(line.value)
 
 
-@Event._extracts('DTEND')
+@Event._extracts('DTEND',
+                 lazy_attrs=('_end_time_epoch', '_end_time_tz'))
 def end(event, line):
     if line:
         #TODO: DRY [1]
@@ -348,6 +557,36 @@ def end(event, line):
         event._end_time = iso_to_arrow(line, tz_dict)
 
 
+@Event._extracts('RRULE', multiple=True, lazy_attrs=('_rrules',))
+def rrule(event, lines):
+    if lines:
+        event._rrules = tuple(line.value for line in reversed(lines))
+
+
+def _split_dates(lines, tz_dict):
+    """Yields the instants of RDATE or EXDATE lines (which may contain
+    several comma separated values)."""
+    for line in reversed(lines):
+        for value in line.value.split(','):
+            value = value.partition('/')[0]  # Beginning of a PERIOD
+            yield iso_to_arrow(ContentLine(line.name, line.params, value),
+                               tz_dict)
+
+
+@Event._extracts('RDATE', multiple=True, lazy_attrs=('_rdates',))
+def rdate(event, lines):
+    if lines:
+        tz_dict = event._classmethod_kwargs['tz']
+        event._rdates = tuple(_split_dates(lines, tz_dict))
+
+
+@Event._extracts('EXDATE', multiple=True, lazy_attrs=('_exdates',))
+def exdate(event, lines):
+    if lines:
+        tz_dict = event._classmethod_kwargs['tz']
+        event._exdates = tuple(_split_dates(lines, tz_dict))
+
+
 @Event._extracts('SUMMARY')
 def summary(event, line):
     event.name = line.value if line else None
@@ -406,6 +645,18 @@ def o_end(event, container):
         container.append(ContentLine('DTEND', value=arrow_to_iso(event.end)))
 
 
+@Event._outputs
+def o_recurrence(event, container):
+    for value in event._rrules:
+        container.append(ContentLine('RRULE', value=value))
+    if event._rdates:
+        value = ','.join(map(arrow_to_iso, event._rdates))
+        container.append(ContentLine('RDATE', value=value))
+    if event._exdates:
+        value = ','.join(map(arrow_to_iso, event._exdates))
+        container.append(ContentLine('EXDATE', value=value))
+
+
 @Event._outputs
 def o_summary(event, container):
     if event.name:
@@ -9,9 +9,276 @@ from six.moves import filter, map, range
 
 from arrow.arrow import Arrow
 import arrow
+from bisect import bisect_left, bisect_right
+from collections import namedtuple, OrderedDict
+import heapq
 
-from .utils import get_arrow
-from .event import Event
+try:
+    import numpy
+except ImportError:  # Only needed by EventList.columns() and expand_array()
+    numpy = None
+
+from .utils import get_arrow, epoch_to_arrow, tzutc, revision
+from .event import Event, _microseconds
+from .freebusy import FreeBusy, merge_periods
+from .recurrence import is_finite, utc_offsets
+
+
+OccurrenceArrays = namedtuple('OccurrenceArrays', ['index', 'begin', 'end'])
+Columns = namedtuple('Columns', ['begin', 'end', 'has_begin', 'recurring'])
+
+
+def _float_timestamps(microseconds):
+    """Returns the float timestamps of UTC `microseconds` (numpy array),
+    with the same rounding as Arrow.float_timestamp."""
+    return (microseconds // 1000000) + (microseconds % 1000000) / 1000000.
+
+
+class _IntervalIndex(object):
+
+    """Static index of the intervals of the events of a list.
+
+    Intervals are sorted by begin and, separately, by end. An implicit
+    segment tree over the begin-sorted intervals stores the max and the
+    min end of each node so that every query runs in O(log n + k).
+    Instants are float timestamps; events without begin are not indexed.
+    Recurring events are not indexed either: their positions are kept in
+    `recurring` and their occurrences are expanded for each query.
+    """
+
+    def __init__(self, events):
+        intervals = []
+        self.recurring = []
+        for position, event in enumerate(events):
+            if event.is_recurring():
+                self.recurring.append(position)
+                continue
+            timestamps = event._timestamps()
+            if timestamps is not None:
+                intervals.append(timestamps + (position,))
+        intervals.sort()
+        self.length = len(events)  # Positions >= length are not indexed
+        self.intervals = intervals
+        self.begins = [interval[0] for interval in intervals]
+        by_end = sorted(intervals, key=lambda interval: interval[1])
+        self.ends = [interval[1] for interval in by_end]
+        self.end_positions = [interval[2] for interval in by_end]
+
+        size = 1
+        while size < len(intervals):
+            size *= 2
+        self.size = size
+        self.max_end = [float('-inf')] * (2 * size)
+        self.min_end = [float('inf')] * (2 * size)
+        for i, interval in enumerate(intervals):
+            self.max_end[size + i] = self.min_end[size + i] = interval[1]
+        for node in reversed(range(1, size)):
+            self.max_end[node] = max(self.max_end[2 * node],
+                                     self.max_end[2 * node + 1])
+            self.min_end[node] = min(self.min_end[2 * node],
+                                     self.min_end[2 * node + 1])
+
+    @classmethod
+    def from_columns(cls, columns):
+        """Builds the same index as cls(events) from the columns of the
+        events (see EventList.columns()), sorting with numpy."""
+        index = cls.__new__(cls)
+        index.recurring = numpy.nonzero(columns.recurring)[0].tolist()
+        positions = numpy.nonzero(columns.has_begin & ~columns.recurring)[0]
+        begins = _float_timestamps(columns.begin[positions])
+        ends = _float_timestamps(columns.end[positions])
+        # Same order as sorting the (begin, end, position) tuples
+        order = numpy.lexsort((positions, ends, begins))
+        begins, ends, positions = begins[order], ends[order], positions[order]
+        by_end = numpy.argsort(ends, kind='mergesort')  # Stable, like sorted()
+
+        index.length = len(columns.begin)
+        index.begins = begins.tolist()
+        index.intervals = list(zip(index.begins, ends.tolist(),
+                                   positions.tolist()))
+        index.ends = ends[by_end].tolist()
+        index.end_positions = positions[by_end].tolist()
+
+        size = 1
+        while size < len(positions):
+            size *= 2
+        index.size = size
+        max_end = numpy.full(2 * size, float('-inf'))
+        min_end = numpy.full(2 * size, float('inf'))
+        max_end[size:size + len(ends)] = min_end[size:size + len(ends)] = ends
+        level = size // 2
+        while level:  # Nodes [level, 2 * level) from their children
+            children = slice(2 * level, 4 * level)
+            max_end[level:2 * level] = numpy.maximum(max_end[children][::2],
+                                                     max_end[children][1::2])
+            min_end[level:2 * level] = numpy.minimum(min_end[children][::2],
+                                                     min_end[children][1::2])
+            level //= 2
+        index.max_end, index.min_end = max_end.tolist(), min_end.tolist()
+        return index
+
+    def _iter_search(self, lo, hi, matches):
+        """Yields the intervals in [lo, hi) (indexes in the begin-sorted
+        intervals) for which `matches(node)` holds, sorted by begin.
+
+        `matches` must hold for a node if it holds for one of its leaves.
+        """
+        stack = [(1, 0, self.size)]
+        while stack:
+            node, node_lo, node_hi = stack.pop()
+            if node_hi <= lo or hi <= node_lo or not matches(node):
+                continue
+            if node >= self.size:
+                yield self.intervals[node - self.size]
+            else:
+                middle = (node_lo + node_hi) // 2
+                stack.append((2 * node + 1, middle, node_hi))
+                stack.append((2 * node, node_lo, middle))
+
+    def _search(self, lo, hi, matches):
+        """Returns the positions of the intervals of _iter_search()."""
+        return [interval[2] for interval in self._iter_search(lo, hi, matches)]
+
+    def _begin_range(self, start, stop):
+        """Indexes of the intervals with start < begin < stop."""
+        lo = 0 if start is None else bisect_right(self.begins, start)
+        hi = len(self.begins) if stop is None \
+            else bisect_left(self.begins, stop)
+        return lo, hi
+
+    def query(self, start, stop, step):
+        """Returns the positions of the events matching the slice
+        [start:stop:step] of :meth:`EventList.__getitem__`."""
+        max_end, min_end = self.max_end, self.min_end
+        if step == 'begin':
+            lo, hi = self._begin_range(start, stop)
+            return [self.intervals[i][2] for i in range(lo, hi)]
+        elif step == 'end':
+            lo = 0 if start is None else bisect_right(self.ends, start)
+            hi = len(self.ends) if stop is None \
+                else bisect_left(self.ends, stop)
+            return self.end_positions[lo:hi]
+        elif step == 'both':  # start < begin <= end < stop
+            lo, hi = self._begin_range(start, stop)
+            if stop is None:
+                return [self.intervals[i][2] for i in range(lo, hi)]
+            return self._search(lo, hi, lambda node: min_end[node] < stop)
+        elif step == 'any':  # begin < stop and start < end
+            lo, hi = self._begin_range(None, stop)
+            if start is None:
+                return [self.intervals[i][2] for i in range(lo, hi)]
+            return self._search(lo, hi, lambda node: max_end[node] > start)
+        elif step == 'inc':  # begin < start and stop < end
+            lo, hi = self._begin_range(None, start)
+            return self._search(lo, hi, lambda node: max_end[node] > stop)
+
+    def overlapping(self, start, stop):
+        """Yields lazily the (begin, end, position) intervals of the slice
+        [start:stop:'any'] (start and stop not None), sorted by begin."""
+        lo, hi = self._begin_range(None, stop)
+        max_end = self.max_end
+        return self._iter_search(lo, hi, lambda node: max_end[node] > start)
+
+    def at(self, instant):
+        """Returns the positions of the events with begin <= instant <= end."""
+        hi = bisect_right(self.begins, instant)
+        max_end = self.max_end
+        return self._search(0, hi, lambda node: max_end[node] >= instant)
+
+
+def _matches(event, start, stop, step):
+    """Same test as _IntervalIndex.query() for a single event."""
+    timestamps = event._timestamps()
+    if timestamps is None:
+        return False
+    begin, end = timestamps
+    after_start = start is None or begin > start
+    before_stop = stop is None or end < stop
+    if step == 'begin':
+        return after_start and (stop is None or begin < stop)
+    elif step == 'end':
+        return (start is None or end > start) and before_stop
+    elif step == 'both':
+        return after_start and before_stop
+    elif step == 'any':
+        return (start is None or end > start) and \
+            (stop is None or begin < stop)
+    elif step == 'inc':
+        return begin < start and stop < end
+
+
+def _select(get, positions, recurring, begin, end, matches):
+    """Returns the events at `positions`, followed at their position by
+    the occurrences of the `recurring` events which overlap [begin, end]
+    and verify `matches`, in the order of the positions.
+
+    Args:
+        get (callable): returns the event at a position
+        positions (list): positions of the matching events, extended\
+        and sorted in place
+        recurring (iterable): positions of the recurring events
+
+    Raises:
+        ValueError: if `end` is None and a recurrence is infinite
+    """
+    occurrences = {}
+    for position in recurring:
+        event = get(position)
+        if end is None and not is_finite(event._rrules):
+            raise ValueError(
+                'The infinite recurrence of {} can not be expanded \
+without an upper bound'.format(event))
+        found = [occurrence for occurrence in event.occurrences(begin, end)
+                 if matches(occurrence)]
+        if found:
+            occurrences[position] = found
+
+    positions.extend(occurrences)
+    positions.sort()
+    events = []
+    for position in positions:
+        if position in occurrences:
+            events.extend(occurrences[position])
+        else:
+            events.append(get(position))
+    return events
+
+
+def iter_conflicts(events):
+    """Yields the pairs of overlapping events of `events`, sweeping them
+    once: runs in O(n log n + k) for n events and k pairs.
+
+    Events overlap if each one begins before the end of the other (see
+    :meth:`EventList.concurrent`). Events without begin are ignored.
+    Works on a stream, like the events of a file sorted by begin.
+
+    Args:
+        events (iterable): events sorted by begin
+
+    Yields:
+        tuple: (first, second) events, with first.begin <= second.begin,\
+        sorted by second then first
+
+    Raises:
+        ValueError: if `events` are not sorted by begin
+    """
+    ends = []  # Heap of (end, rank) of the events not ended yet
+    active = OrderedDict()  # rank -> event not ended yet, sorted by rank
+    previous = None
+    for rank, event in enumerate(events):
+        timestamps = event._timestamps()
+        if timestamps is None:
+            continue
+        begin, end = timestamps
+        if previous is not None and begin < previous:
+            raise ValueError('The events must be sorted by begin')
+        previous = begin
+        while ends and ends[0][0] <= begin:
+            del active[heapq.heappop(ends)[1]]
+        for other in active.values():
+            yield other, event
+        heapq.heappush(ends, (end, rank))
+        active[rank] = event
 
 
 class EventList(list):
@@ -19,6 +286,10 @@ class EventList(list):
     """EventList is a subclass of the standard :class:`list`.
 
     It can be used as a list but also has super slicing capabilities and some helpers.
+
+    Time slices, :meth:`at` and :meth:`now` are answered by an interval
+    index built on the first such query and kept up to date as the list
+    or its events change.
     """
 
     def __init__(self, arg=[]):
@@ -31,6 +302,15 @@ class EventList(list):
         """
 
         super(EventList, self).__init__()
+        # Changed by the events of self when their times or uid change
+        self._times_version = 0
+        self._uid_version = 0
+        self._index = None
+        self._index_version = None
+        self._columns = None
+        self._columns_version = None
+        self._uids = None
+        self._uids_version = None
 
         for elem in arg:
             if not isinstance(elem, Event):
@@ -102,46 +382,178 @@ or None not '{}'".format(sl.step))
             step = sl.step
 
         begin, end = get_arrow(sl.start), get_arrow(sl.stop)
-        condition0 = lambda x: True
-
-        if begin:
-            condition_begin1 = lambda x: condition0(x) and x.begin > begin
-            condition_end1 = lambda x: condition0(x) and x.end > begin
-            if step == 'begin':
-                condition1 = condition_begin1
-            elif step == 'end':
-                condition1 = condition_end1
-            elif step == 'any':
-                condition1 = lambda x: condition_begin1(x) or \
-                    condition_end1(x)
-            elif step == 'both':
-                condition1 = lambda x: condition_begin1(x) and \
-                    condition_end1(x)
-        else:
-            condition1 = condition0
-
-        if end:
-            condition_begin2 = lambda x: condition1(x) and x.begin < end
-            condition_end2 = lambda x: condition1(x) and x.end < end
-            if step == 'begin':
-                condition2 = condition_begin2
-            elif step == 'end':
-                condition2 = condition_end2
-            elif step == 'any':
-                condition2 = lambda x: condition_begin2(x) or \
-                    condition_end2(x)
-            elif step == 'both':
-                condition2 = lambda x: condition_begin2(x) and \
-                    condition_end2(x)
-        else:
-            condition2 = condition1
+        if step == 'inc' and (not begin or not end):
+            return []
+        start = begin.float_timestamp if begin else None
+        stop = end.float_timestamp if end else None
+
+        index = self._get_index()
+        positions = index.query(start, stop, step)
+        recurring = list(index.recurring)
+        for position in range(index.length, len(self)):  # Not indexed yet
+            event = self[position]
+            if event.is_recurring():
+                recurring.append(position)
+            elif _matches(event, start, stop, step):
+                positions.append(position)
+        return _select(
+            super(EventList, self).__getitem__, positions, recurring,
+            begin, end,
+            lambda occurrence: _matches(occurrence, start, stop, step))
+
+    def _get_index(self):
+        """Returns the interval index of the events, (re)building it
+        if the list or the times of an event changed."""
+        index = getattr(self, '_index', None)
+        # Read before building: a change meanwhile outdates the new index
+        version = getattr(self, '_times_version', 0)
+        if index is None or self._index_version != version \
+                or len(self) < index.length \
+                or len(self) - index.length > max(64, index.length // 8):
+            if numpy is None:
+                index = _IntervalIndex(self)
+            else:
+                index = _IntervalIndex.from_columns(self.columns())
+            self._index = index
+            self._index_version = version
+        return index
+
+    def _invalidate_index(self):
+        self._index = None
+        self._columns = None
+        self._uids = None
+
+    def columns(self):
+        """Returns the begin and end of the events as columns, to filter
+        them with numpy operations on whole arrays. For example, the
+        positions of the events occuring at `instant` (in microseconds)::
+
+            c = events.columns()
+            numpy.nonzero(c.has_begin & (c.begin <= instant) &
+                          (instant <= c.end))[0]
+
+        The columns are built once and kept until the list or the times
+        of one of its events change.
+        Recurring events are only described by their first occurrence,
+        see :meth:`expand_array` for the others.
+
+        Returns:
+            Columns: `begin` and `end` (numpy.int64 arrays of UTC
+            microseconds since the epoch, 0 for the events without begin),
+            `has_begin` and `recurring` (numpy boolean arrays), with a row
+            per event, in the order of the list.
 
-        if step == 'inc':
-            if not begin or not end:
-                return []
-            condition2 = lambda x: x.begin < begin and end < x.end
+        Raises:
+            ImportError: if numpy is not installed
+        """
+        if numpy is None:
+            raise ImportError('EventList.columns() requires numpy')
+        columns = getattr(self, '_columns', None)
+        version = getattr(self, '_times_version', 0)
+        if columns is not None and len(columns.begin) == len(self) \
+                and self._columns_version == version:
+            return columns
+
+        # Wall times are gathered with the code of their time zone, and
+        # converted to UTC a time zone at a time
+        walls, codes, recurring = [], [], []
+        zones = {}  # id(tzinfo) -> code, tzinfo
+        for event in self:
+            recurring.append(event.is_recurring())
+            epochs = event._epochs()
+            if epochs is None:
+                walls.extend((0, 0))
+                codes.extend((-1, -1))
+                continue
+            for wall, tzinfo in ((epochs[0], epochs[1]),
+                                 (epochs[2], epochs[3])):
+                zone = zones.get(id(tzinfo))
+                if zone is None:
+                    zone = zones[id(tzinfo)] = (len(zones), tzinfo)
+                walls.append(wall)
+                codes.append(zone[0])
+
+        instants = numpy.array(walls, dtype=numpy.int64)
+        codes = numpy.array(codes, dtype=numpy.int64)
+        for code, tzinfo in zones.values():
+            in_zone = codes == code
+            instants[in_zone] -= utc_offsets(instants[in_zone], tzinfo)
+        columns = Columns(instants[0::2], instants[1::2], codes[0::2] >= 0,
+                          numpy.array(recurring, dtype=bool))
+        self._columns = columns
+        self._columns_version = version
+        return columns
+
+    def expand_array(self, start=None, stop=None):
+        """Expands the occurrences of the events overlapping [start, stop]
+        into numpy arrays, without building an object per occurrence.
+
+        Simple recurrence rules (see ics.recurrence.rrule_array()) are
+        expanded with operations on whole arrays, the others with the
+        same rules as :meth:`ics.event.Event.occurrences`.
+
+        Args:
+            start (Arrow-convertible): lower bound or None
+            stop (Arrow-convertible): upper bound or None
 
-        return list(filter(condition2, self))
+        Returns:
+            OccurrenceArrays: `index` (position of the event in the list),
+            `begin` and `end` (UTC numpy.datetime64[us]) arrays, sorted by
+            index and begin.
+
+        Raises:
+            ImportError: if numpy is not installed
+            ValueError: if `stop` is None and a recurrence is infinite
+        """
+        if numpy is None:
+            raise ImportError('EventList.expand_array() requires numpy')
+        start, stop = get_arrow(start), get_arrow(stop)
+        lo = None if start is None else \
+            int(round(start.float_timestamp * 1000000))
+        hi = None if stop is None else \
+            int(round(stop.float_timestamp * 1000000))
+
+        # Single events are read from the columns, recurring events are
+        # gathered by time zone to compute the UTC offsets of all their
+        # occurrences at once
+        columns = self.columns()
+        single = numpy.nonzero(columns.has_begin & ~columns.recurring)[0]
+        indexes = [single]
+        begins = [columns.begin[single]]
+        ends = [columns.end[single]]
+        zones = {}  # id(tzinfo) -> tzinfo, positions, wall times, lengths
+        for position in numpy.nonzero(
+                columns.has_begin & columns.recurring)[0].tolist():
+            event = self[position]
+            tzinfo = event._begin_tz
+            length = event._length()
+            walls = event._walls_array(start, stop, length)
+            zone = zones.setdefault(id(tzinfo), (tzinfo, [], [], []))
+            zone[1].append(numpy.full(len(walls), position, numpy.int64))
+            zone[2].append(walls)
+            zone[3].append(numpy.full(len(walls), length, numpy.int64))
+
+        for tzinfo, positions, walls, lengths in zones.values():
+            walls = numpy.concatenate(walls)
+            end_walls = walls + numpy.concatenate(lengths)
+            indexes.append(numpy.concatenate(positions))
+            begins.append(walls - utc_offsets(walls, tzinfo))
+            ends.append(end_walls - utc_offsets(end_walls, tzinfo))
+        indexes = numpy.concatenate(indexes)
+        begins = numpy.concatenate(begins)
+        ends = numpy.concatenate(ends)
+
+        matches = numpy.ones(len(indexes), dtype=bool)
+        if lo is not None:
+            matches &= ends >= lo
+        if hi is not None:
+            matches &= begins <= hi
+        indexes, begins, ends = \
+            indexes[matches], begins[matches], ends[matches]
+        order = numpy.lexsort((begins, indexes))
+        return OccurrenceArrays(indexes[order],
+                                begins[order].astype('datetime64[us]'),
+                                ends[order].astype('datetime64[us]'))
 
     def today(self, strict=False):
         """Args:
@@ -171,11 +583,7 @@ or None not '{}'".format(sl.step))
         Returns:
             list<Event>: all events that occurs now
         """
-        now = []
-        for event in self:
-            if event.begin <= arrow.now() <= event.end:
-                now.append(event)
-        return now
+        return self.at(arrow.now())
 
     def at(self, instant):
         """Args:
@@ -184,11 +592,25 @@ or None not '{}'".format(sl.step))
         Returns:
             list<Event>: all events that are occuring during `instant`.
         """
-        at = []
-        for event in self:
-            if event.begin <= instant <= event.end:
-                at.append(event)
-        return at
+        instant = get_arrow(instant)
+        timestamp = instant.float_timestamp
+
+        def matches(event):
+            timestamps = event._timestamps()
+            return timestamps is not None and \
+                timestamps[0] <= timestamp <= timestamps[1]
+
+        index = self._get_index()
+        positions = index.at(timestamp)
+        recurring = list(index.recurring)
+        for position in range(index.length, len(self)):  # Not indexed yet
+            event = self[position]
+            if event.is_recurring():
+                recurring.append(position)
+            elif matches(event):
+                positions.append(position)
+        return _select(super(EventList, self).__getitem__, positions,
+                       recurring, instant, instant, matches)
 
     def concurrent(self, event):
         """Args:
@@ -196,18 +618,176 @@ or None not '{}'".format(sl.step))
         Returns:
             list<Event>: all events that are overlapping `event`
         """
-        a = self[event.begin:event.end:'any']
-        b = self[None:event.begin:'begin']
-        c = self[event.end:None:'end']
-        return list(set(a) | (set(b) & set(c)))
+        # Events enclosing `event` overlap it too
+        return list(set(self[event.begin:event.end:'any']))
+
+    def conflicts(self, start=None, stop=None):
+        """Finds all the overlapping events at once, in O(n log n + k)
+        rather than calling :meth:`concurrent` for each event.
+
+        Recurring events are expanded into their occurrences (see
+        :meth:`ics.event.Event.occurrences`).
+
+        Args:
+            start (Arrow-convertible): lower bound or None
+            stop (Arrow-convertible): upper bound or None
+
+        Returns:
+            list<tuple>: the pairs of overlapping events among\
+            self[start:stop:'any'], see :func:`iter_conflicts`
+
+        Raises:
+            ValueError: if `stop` is None and a recurrence is infinite
+        """
+        events = self[start:stop:'any']
+        keys = [event._timestamps()[0] for event in events]
+        order = sorted(range(len(events)), key=keys.__getitem__)
+        return list(iter_conflicts(events[i] for i in order))
+
+    def freebusy(self, start, stop, granularity=None):
+        """Merges the times of the events between `start` and `stop` into
+        disjoint busy periods, in a single pass over the sorted events.
+
+        Recurring events are expanded into their occurrences (see
+        :meth:`ics.event.Event.occurrences`).
+
+        Args:
+            start (Arrow-convertible)
+            stop (Arrow-convertible)
+            granularity (datetime.timedelta): if given, the busy periods\
+            are widened to the buckets of this length starting at `start`
+
+        Returns:
+            FreeBusy: a VFREEBUSY component of the busy periods, in UTC
+        """
+        start, stop = get_arrow(start), get_arrow(stop)
+        periods = self._busy_periods(start, stop, granularity)
+        return FreeBusy(begin=start, end=stop, periods=[
+            (epoch_to_arrow(begin, tzutc), epoch_to_arrow(end, tzutc))
+            for begin, end in periods])
+
+    def _busy_periods(self, start, stop, granularity=None):
+        """Yields the busy periods of :meth:`freebusy` (Arrow bounds) as
+        sorted (begin, end) UTC microseconds since the epoch.
+
+        The events are read lazily by begin (see _iter_timestamps()):
+        stopping early skips the events beginning later.
+        """
+        lo = int(round(start.float_timestamp * 1000000))
+        hi = int(round(stop.float_timestamp * 1000000))
+        step = _microseconds(granularity) if granularity else None
+
+        def periods():
+            # Clipping and widening keep the periods sorted
+            for begin, end in self._iter_timestamps(start, stop):
+                begin = max(lo, int(round(begin * 1000000)))
+                end = min(hi, int(round(end * 1000000)))
+                if begin >= end:
+                    continue
+                if step:
+                    begin = lo + (begin - lo) // step * step
+                    end = min(hi, lo - (lo - end) // step * step)
+                yield begin, end
+        return merge_periods(periods())
+
+    def _iter_timestamps(self, start, stop):
+        """Yields the (begin, end) timestamps of the events and occurrences
+        of self[start:stop:'any'] (Arrow bounds), sorted by begin.
+
+        Indexed events are searched lazily and each recurrence is expanded
+        as it is consumed; only the events not indexed yet are sorted
+        beforehand.
+        """
+        start_ts, stop_ts = start.float_timestamp, stop.float_timestamp
+        index = self._get_index()
+        sources = [(interval[:2]
+                    for interval in index.overlapping(start_ts, stop_ts))]
+        recurring, tail = list(index.recurring), []
+        for position in range(index.length, len(self)):  # Not indexed yet
+            event = self[position]
+            if event.is_recurring():
+                recurring.append(position)
+            elif _matches(event, start_ts, stop_ts, 'any'):
+                tail.append(event._timestamps())
+        tail.sort()
+        sources.append(tail)
+        for position in recurring:
+            sources.append(
+                occurrence._timestamps()
+                for occurrence in self[position].occurrences(start, stop)
+                if _matches(occurrence, start_ts, stop_ts, 'any'))
+        return heapq.merge(*sources)
+
+    def _get_uids(self):
+        """Returns a dict: uid -> position of the first event with this
+        uid, (re)building it if the list or the uid of an event changed."""
+        uids = getattr(self, '_uids', None)
+        version = getattr(self, '_uid_version', 0)
+        if uids is None or self._uids_version != version:
+            uids = {}
+            for position, event in enumerate(self):
+                uids.setdefault(event.uid, position)
+            self._uids = uids
+            self._uids_version = version
+        return uids
+
+    def get(self, uid, default=None):
+        """Returns the first event with the given `uid`, in O(1).
+
+        Returns:
+            Event: or `default` if no event has this `uid`
+        """
+        position = self._get_uids().get(uid)
+        if position is None:
+            return default
+        return super(EventList, self).__getitem__(position)
+
+    def __contains__(self, item):
+        """`item` may be an event or an uid: events are equal if they
+        have the same uid."""
+        if isinstance(item, Event):
+            return item.uid in self._get_uids()
+        elif isinstance(item, string_types):
+            return item in self._get_uids()
+        return super(EventList, self).__contains__(item)
+
+    def update(self, other):
+        """Merges the events of `other` into self, in a single pass.
+
+        Events with a new uid are appended. Otherwise, the most recent
+        version (see :func:`ics.utils.revision`) of the event replaces the
+        first event with this uid, the one of `other` in case of a tie.
+
+        Raises:
+            ValueError: if `other` contains elements which are not\
+            :class:`ics.event.Event`
+        """
+        uids = self._get_uids()
+        replaced = False
+        for event in other:
+            if not isinstance(event, Event):
+                raise ValueError('EventList may only contain elements of type "Event" not {}'
+                    .format(type(event)))
+            position = uids.get(event.uid)
+            if position is None:
+                self.append(event)  # Adds its uid to `uids`
+            elif revision(event) >= revision(self[position]):
+                super(EventList, self).__setitem__(position, event)
+                event._watch(self)
+                replaced = True
+        if replaced:  # Same uids but other times
+            self._index = None
+            self._columns = None
 
     def _remove_duplicates(self):
-        seen = set()
-        for i in reversed(range(len(self))):
-            if self[i] in seen:
-                del self[i]
-            else:
-                seen.add(self[i])
+        # Keeps the last of the equal events, rebuilding the list at once
+        seen, kept = set(), []
+        for event in reversed(self):
+            if event not in seen:
+                seen.add(event)
+                kept.append(event)
+        kept.reverse()
+        self[:] = kept
 
     def __add__(self, *args, **kwargs):
         """Add 2 :class:`ics.eventlist.EventList`.
@@ -246,11 +826,59 @@ or None not '{}'".format(sl.step))
             raise ValueError('EventList may only contain elements of type "Event" not {}'
                 .format(type(val)))
         super(EventList, self).__setitem__(key, val)
+        for elem in (val if isinstance(key, slice) else (val,)):
+            elem._watch(self)
+        self._invalidate_index()
 
     def __setslice__(self, i, j, val):
         """Compatibility for python2"""
         return self.__setitem__(slice(i, j), val)
 
+    def __delitem__(self, key):
+        super(EventList, self).__delitem__(key)
+        self._invalidate_index()
+
+    def __delslice__(self, i, j):
+        """Compatibility for python2"""
+        return self.__delitem__(slice(i, j))
+
+    def __iadd__(self, other):
+        self.extend(other)
+        return self
+
+    def extend(self, iterable):
+        """Append each element of `iterable`, see :meth:`append`."""
+        for elem in iterable:
+            self.append(elem)
+
+    def insert(self, i, elem):
+        if not isinstance(elem, Event):
+            raise ValueError('EventList may only contain elements of type "Event" not {}'
+                .format(type(elem)))
+        super(EventList, self).insert(i, elem)
+        elem._watch(self)
+        self._invalidate_index()
+
+    def pop(self, *args):
+        elem = super(EventList, self).pop(*args)
+        self._invalidate_index()
+        return elem
+
+    def remove(self, elem):
+        super(EventList, self).remove(elem)
+        self._invalidate_index()
+
+    def clear(self):
+        del self[:]
+
+    def sort(self, *args, **kwargs):
+        super(EventList, self).sort(*args, **kwargs)
+        self._invalidate_index()
+
+    def reverse(self):
+        super(EventList, self).reverse()
+        self._invalidate_index()
+
     def append(self, elem):
         """Append a element to self and verifies that it's an :class:`ics.event.Event`.
 
@@ -263,3 +891,7 @@ or None not '{}'".format(sl.step))
             raise ValueError('EventList may only contain elements of type "Event" not {}'
                 .format(type(elem)))
         super(EventList, self).append(elem)
+        elem._watch(self)
+        uids = getattr(self, '_uids', None)
+        if uids is not None:
+            uids.setdefault(elem.uid, len(self) - 1)
@@ -0,0 +1,254 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals, absolute_import
+
+from six import PY2, PY3, StringIO, string_types, text_type, integer_types
+from six.moves import filter, map, range
+
+import arrow
+import heapq
+from itertools import islice
+
+from .component import Component
+from .utils import (
+    parse_duration,
+    iso_to_arrow,
+    get_arrow,
+    arrow_to_iso,
+    uid_gen,
+    epoch_to_arrow,
+    tzutc,
+)
+from .parse import ContentLine, Container
+from .event import _microseconds
+
+
+def merge_periods(periods):
+    """Merges the periods which overlap or touch, in a single pass.
+
+    Args:
+        periods (iterable): (begin, end) tuples sorted by begin
+
+    Yields:
+        tuple: the disjoint (begin, end) periods covered by `periods`,\
+        sorted by begin
+    """
+    begin = end = None
+    for period_begin, period_end in periods:
+        if end is not None and period_begin <= end:
+            end = max(end, period_end)
+            continue
+        if end is not None:
+            yield begin, end
+        begin, end = period_begin, period_end
+    if end is not None:
+        yield begin, end
+
+
+def _free_periods(busy, lo, hi):
+    """Yields the gaps of the sorted disjoint `busy` periods in [lo, hi)."""
+    cursor = lo
+    for begin, end in busy:
+        if begin >= hi:
+            break
+        if begin > cursor:
+            yield cursor, begin
+        cursor = max(cursor, end)
+    if cursor < hi:
+        yield cursor, hi
+
+
+def _intersect(periods, others):
+    """Yields the intersections of two iterables of sorted disjoint
+    periods, reading both lazily."""
+    others = iter(others)
+    other = next(others, None)
+    for begin, end in periods:
+        while other is not None and other[1] <= begin:
+            other = next(others, None)
+        while other is not None and other[0] < end:
+            yield max(begin, other[0]), min(end, other[1])
+            if other[1] > end:
+                break  # May also intersect the next period
+            other = next(others, None)
+        if other is None:
+            return
+
+
+def _microseconds_period(period):
+    begin, end = map(get_arrow, period)
+    return (int(round(begin.float_timestamp * 1000000)),
+            int(round(end.float_timestamp * 1000000)))
+
+
+def find_free_slots(calendars, duration, window, constraints=None, limit=1):
+    """Finds the periods of `window` during which every calendar is free.
+
+    The busy periods of each calendar are read lazily by begin and merged
+    with a heap, so that the search stops at the `limit` first free slots
+    without reading the events beginning later.
+
+    Args:
+        calendars (iterable): :class:`ics.icalendar.Calendar` or\
+        :class:`ics.eventlist.EventList` objects
+        duration (datetime.timedelta): minimal length of a free slot
+        window (tuple): (begin, end) Arrow-convertible bounds of the search
+        constraints (iterable): if given, (begin, end) Arrow-convertible\
+        periods sorted by begin (working hours for example) which must\
+        contain the slots
+        limit (int): maximal number of slots returned, None for all
+
+    Returns:
+        list<tuple>: the first free (begin, end) periods, in UTC, at least\
+        `duration` long and sorted by begin
+    """
+    start, stop = map(get_arrow, window)
+    lo, hi = _microseconds_period((start, stop))
+    length = _microseconds(duration)
+
+    busy = []
+    for calendar in calendars:
+        events = getattr(calendar, 'events', calendar)
+        busy.append(events._busy_periods(start, stop))
+    free = _free_periods(merge_periods(heapq.merge(*busy)), lo, hi)
+    if constraints is not None:
+        allowed = merge_periods(map(_microseconds_period, constraints))
+        free = _intersect(free, allowed)
+
+    slots = ((begin, end) for begin, end in free if end - begin >= length)
+    return [(epoch_to_arrow(begin, tzutc), epoch_to_arrow(end, tzutc))
+            for begin, end in islice(slots, limit)]
+
+
+class FreeBusy(Component):
+
+    """The busy time of a calendar between two instants (a VFREEBUSY).
+
+    See :meth:`ics.eventlist.EventList.freebusy`.
+    """
+
+    _TYPE = "VFREEBUSY"
+    _EXTRACTORS = []
+    _OUTPUTS = []
+
+    def __init__(self,
+                 begin=None,
+                 end=None,
+                 periods=None,
+                 uid=None,
+                 created=None):
+        """Instanciates a new :class:`ics.freebusy.FreeBusy`.
+
+        Args:
+            begin (Arrow-compatible)
+            end (Arrow-compatible)
+            periods (list): busy (begin, end) tuples of Arrow-compatible
+            uid (string): must be unique
+            created (Arrow-compatible)
+        """
+        self.begin = get_arrow(begin)
+        self.end = get_arrow(end)
+        self.periods = [(get_arrow(b), get_arrow(e))
+                        for b, e in periods or ()]
+        self.uid = uid_gen() if not uid else uid
+        self.created = get_arrow(created)
+        self._unused = Container(name='VFREEBUSY')
+
+    def __urepr__(self):
+        if self.begin and self.end:
+            return "<FreeBusy {} to {}: {} busy period{}>".format(
+                self.begin, self.end, len(self.periods),
+                "s" if len(self.periods) > 1 else "")
+        return "<FreeBusy: {} busy period{}>".format(
+            len(self.periods), "s" if len(self.periods) > 1 else "")
+
+
+######################
+####### Inputs #######
+
+def _tz_dict(freebusy):
+    return freebusy._classmethod_kwargs.get('tz', {})
+
+
+@FreeBusy._extracts('DTSTAMP')
+def created(freebusy, line):
+    if line:
+        freebusy.created = iso_to_arrow(line, _tz_dict(freebusy))
+
+
+@FreeBusy._extracts('DTSTART')
+def start(freebusy, line):
+    if line:
+        freebusy.begin = iso_to_arrow(line, _tz_dict(freebusy))
+
+
+@FreeBusy._extracts('DTEND')
+def end(freebusy, line):
+    if line:
+        freebusy.end = iso_to_arrow(line, _tz_dict(freebusy))
+
+
+@FreeBusy._extracts('FREEBUSY', multiple=True)
+def periods(freebusy, lines):
+    # PERIOD values: comma separated begin/end or begin/duration
+    for line in reversed(lines):
+        if 'FREE' in line.params.get('FBTYPE', []):
+            continue  # Only the busy periods are kept
+        for value in line.value.split(','):
+            begin, _, end = value.partition('/')
+            begin = iso_to_arrow(ContentLine(line.name, line.params, begin))
+            if end.lstrip('+-').startswith('P'):
+                end = begin + parse_duration(end)
+            else:
+                end = iso_to_arrow(ContentLine(line.name, line.params, end))
+            freebusy.periods.append((begin, end))
+
+
+@FreeBusy._extracts('UID')
+def uid(freebusy, line):
+    if line:
+        freebusy.uid = line.value
+
+
+######################
+###### Outputs #######
+@FreeBusy._outputs
+def o_created(freebusy, container):
+    if freebusy.created:
+        instant = freebusy.created
+    else:
+        instant = arrow.now()
+
+    container.append(ContentLine('DTSTAMP', value=arrow_to_iso(instant)))
+
+
+@FreeBusy._outputs
+def o_start(freebusy, container):
+    if freebusy.begin:
+        container.append(
+            ContentLine('DTSTART', value=arrow_to_iso(freebusy.begin)))
+
+
+@FreeBusy._outputs
+def o_end(freebusy, container):
+    if freebusy.end:
+        container.append(
+            ContentLine('DTEND', value=arrow_to_iso(freebusy.end)))
+
+
+@FreeBusy._outputs
+def o_periods(freebusy, container):
+    for begin, end in freebusy.periods:
+        value = '{}/{}'.format(arrow_to_iso(begin), arrow_to_iso(end))
+        container.append(ContentLine('FREEBUSY', value=value))
+
+
+@FreeBusy._outputs
+def o_uid(freebusy, container):
+    if freebusy.uid:
+        uid = freebusy.uid
+    else:
+        uid = uid_gen()
+
+    container.append(ContentLine('UID', value=uid))
@@ -11,6 +11,18 @@ from arrow.arrow import Arrow
 import arrow
 import copy
 import collections
+import hashlib
+import io
+import mmap
+import os
+import pickle
+import re
+import time
+
+try:
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+except ImportError:  # Python 2 without the futures backport
+    ProcessPoolExecutor = as_completed = None
 
 from .component import Component
 from .event import Event
@@ -20,10 +32,25 @@ from .todolist import TodoList
 from .parse import (
     lines_to_container,
     string_to_container,
+    bytes_to_container,
+    iter_components,
+    fold_line,
     ContentLine,
     Container,
 )
-from .utils import remove_x
+from .utils import remove_x, LRUCache
+
+
+# Compiled VTIMEZONE blocks shared by every Calendar of the process, keyed
+# by a hash of the block. Feeds usually carry the same few VTIMEZONEs:
+# tzical only has to run once for each of them.
+vtimezone_cache = LRUCache(maxsize=256)
+
+# A VEVENT or a VTODO block (they do not nest) and a VTIMEZONE block
+_COMPONENT_RE = re.compile(br'^BEGIN:(VEVENT|VTODO)\r?$.*?^END:\1\r?$\n?',
+                           re.M | re.S)
+_VTIMEZONE_RE = re.compile(br'^BEGIN:VTIMEZONE\r?$.*?^END:VTIMEZONE\r?$\n?',
+                           re.M | re.S)
 
 
 # GLS: Design Questions for pyics:
@@ -41,14 +68,20 @@ class Calendar(Component):
     _EXTRACTORS = []
     _OUTPUTS = []
 
-    def __init__(self, imports=None, events=None, todos=None, creator=None):
+    def __init__(self, imports=None, events=None, todos=None, creator=None,
+                 lazy=False):
         """Instanciates a new Calendar.
 
         Args:
-            imports (string or list of lines/strings): data to be imported into the Calendar(),
+            imports (string or list of lines/strings): data to be imported into the Calendar(),\
+            or UTF-8 octets (bytes, bytearray or mmap) which are only\
+            decoded a line at a time
             events (list of Events or EventList): will be casted to :class:`ics.eventlist.EventList`
             todos (list of Todos or TodoList): will be casted to :class:`ics.todolist.TodoList`
             creator (string): uid of the creator program.
+            lazy (bool): if True, the dates of the imported events and todos\
+            are only parsed when they are first read, and untouched events\
+            and todos are serialized back from their original lines.
 
         If `imports` is specified, __init__ ignores every other argument.
         """
@@ -60,6 +93,7 @@ class Calendar(Component):
         self._unused = Container(name='VCALENDAR')
         self.scale = None
         self.method = None
+        self._lazy = lazy
 
         if events is None:
             events = EventList()
@@ -71,6 +105,8 @@ class Calendar(Component):
                 container = string_to_container(imports)
             elif isinstance(imports, str):
                 container = string_to_container(imports)
+            elif isinstance(imports, (bytes, bytearray, mmap.mmap)):
+                container = bytes_to_container(imports)
             elif isinstance(imports, collections.Iterable):
                 container = lines_to_container(imports)
             else:
@@ -109,12 +145,43 @@ class Calendar(Component):
             >>> c.append(Todo(name="My cool todo"))
             >>> open('my.ics', 'w').writelines(c)
         """
-        for line in str(self).split('\n'):
+        for line in self._to_container().iter_lines():
             l = line + '\n'
             if PY2:
                 l = l.encode('utf-8')
             yield l
 
+    def iter_lines(self):
+        """Returns:
+        iterable: the calendar in the rfc5545 format, one physical line
+        at a time. Lines are folded at 75 octets and end with CRLF.
+
+        Events and todos are serialized one after the other, so the
+        whole text of the calendar is never held in memory.
+        """
+        for line in self._to_container().iter_lines():
+            for physical_line in fold_line(line):
+                l = physical_line + '\r\n'
+                if PY2:
+                    l = l.encode('utf-8')
+                yield l
+
+    def dump(self, fileobj):
+        """Writes the calendar to `fileobj` in the rfc5545 format,
+        see :meth:`iter_lines`.
+
+        Args:
+            fileobj (file-like): a file opened for writing
+
+        Example:
+
+            >>> with open('my.ics', 'w') as f:
+            ...     c.dump(f)
+        """
+        write = fileobj.write
+        for line in self.iter_lines():
+            write(line)
+
     def __eq__(self, other):
         if len(self.events) != len(other.events):
             return False
@@ -227,11 +294,145 @@ class Calendar(Component):
         clone._timezones = copy.copy(self._timezones)
         return clone
 
+    @classmethod
+    def from_file(cls, path, workers=None, lazy=False):
+        """Loads the iCalendar file at `path`.
+
+        The file is mapped in memory (mmap) and decoded a line at a time.
+        If `workers` is greater than 1, the events and todos are parsed by
+        a pool of `workers` processes: the byte ranges of the VEVENT and
+        VTODO blocks are found first, then parsed by chunks, and gathered
+        in the same order as without pool. The rest of the file
+        (VTIMEZONE, …) is parsed by the calling process and shared with
+        the results.
+
+        Args:
+            path (string): path of the file, encoded in UTF-8
+            workers (int): number of processes, None for no pool
+            lazy (bool): see :class:`Calendar`
+
+        Raises:
+            ImportError: if `workers` is greater than 1 and\
+            concurrent.futures is missing (python 2 without `futures`)
+        """
+        if not workers or workers <= 1:
+            with io.open(path, 'rb') as fileobj:
+                if os.fstat(fileobj.fileno()).st_size == 0:
+                    return cls(b'', lazy=lazy)
+                data = mmap.mmap(fileobj.fileno(), 0, access=mmap.ACCESS_READ)
+                try:
+                    return cls(data, lazy=lazy)
+                finally:
+                    data.close()
+        if ProcessPoolExecutor is None:
+            raise ImportError('Calendar.from_file(workers=...) requires '
+                              'concurrent.futures (futures on python 2)')
+
+        with io.open(path, 'rb') as fileobj:
+            data = fileobj.read()
+        spans = [match.span() for match in _COMPONENT_RE.finditer(data)]
+        skeleton, position = [], 0
+        for begin, end in spans:
+            skeleton.append(data[position:begin])
+            position = end
+        skeleton.append(data[position:])
+        skeleton = b''.join(skeleton)
+        calendar = cls(skeleton.decode('utf-8'), lazy=lazy)
+        vtimezones = _VTIMEZONE_RE.findall(skeleton)
+
+        # A few chunks per worker to balance their load
+        size = max(1, -(-len(spans) // (workers * 4)))
+        chunks = [b''.join(data[begin:end] for begin, end in spans[i:i + size])
+                  for i in range(0, len(spans), size)]
+        events, todos = [], []
+        with ProcessPoolExecutor(workers) as executor:
+            results = executor.map(_parse_components, chunks,
+                                   [vtimezones] * len(chunks),
+                                   [lazy] * len(chunks))
+            for result in results:
+                unpickler = _ComponentUnpickler(io.BytesIO(result),
+                                                calendar._timezones)
+                for component in unpickler.load():
+                    if isinstance(component, Event):
+                        events.append(component)
+                    else:
+                        todos.append(component)
+        # Same order as the extractors of Calendar(), which read the
+        # blocks from the end
+        events.reverse()
+        todos.reverse()
+        calendar.events = events
+        calendar.todos = todos
+        return calendar
+
+    @classmethod
+    def iter_components(cls, source):
+        """Streams the events and todos of an iCalendar file.
+
+        Components are parsed one at a time: the whole file is never
+        loaded in memory. VTIMEZONE blocks are resolved as they are met
+        and are available to every following event or todo.
+
+        Args:
+            source (string or file-like): path of the file or \
+            file object opened in text mode
+
+        Returns:
+            iterator of :class:`ics.event.Event` and :class:`ics.todo.Todo`
+        """
+        if isinstance(source, string_types):
+            with io.open(source, encoding='utf-8') as fileobj:
+                for component in cls.iter_components(fileobj):
+                    yield component
+            return
+
+        timezones = {}
+        for container in iter_components(source):
+            if container.name == 'VTIMEZONE':
+                timezones.update(_compile_vtimezone(container))
+            elif container.name == 'VEVENT':
+                yield Event._from_container(container, tz=timezones)
+            elif container.name == 'VTODO':
+                yield Todo._from_container(container, tz=timezones)
+
+    @classmethod
+    def iter_events(cls, source):
+        """Streams the events of an iCalendar file.
+
+        Same as :meth:`iter_components` but only yields
+        :class:`ics.event.Event` objects.
+        """
+        for component in cls.iter_components(source):
+            if isinstance(component, Event):
+                yield component
+
+    @classmethod
+    def merge(cls, calendars):
+        """Merges calendars into a new one, in a single pass.
+
+        Events and todos are deduplicated by uid, keeping their most
+        recent version (highest SEQUENCE, then LAST-MODIFIED, see
+        :meth:`ics.eventlist.EventList.update`). They are not copied.
+        The VTIMEZONE definitions of all the calendars are kept.
+
+        Args:
+            calendars (iterable): :class:`ics.icalendar.Calendar` objects,\
+            read one at a time
+
+        Returns:
+            Calendar: a new calendar
+        """
+        merged = cls()
+        for calendar in calendars:
+            merged._timezones.update(calendar._timezones)
+            merged.events.update(calendar.events)
+            merged.todos.update(calendar.todos)
+        return merged
+
     def __add__(self, other):
-        events = self.events + other.events
-        todos = self.todos + other.todos
-        return Calendar(events,todos)    # GLS: ???: not sure about this one!!!
-        #return Calendar(events)
+        """Returns:
+            Calendar: the merge of self and `other`, see :meth:`merge`"""
+        return self.merge((self, other))
 
 
 ######################
@@ -281,21 +482,182 @@ def timezone(calendar, vtimezones):
     Parses them and adds them to calendar._timezones.
     """
     for vtimezone in vtimezones:
-        remove_x(vtimezone)  # Remove non standard lines from the block
+        calendar._timezones.update(_compile_vtimezone(vtimezone))
+
+
+def _compile_vtimezone(vtimezone):
+    """Returns a dict of the timezones (TZID -> tzinfo) defined
+    by a VTIMEZONE block.
+
+    The dict is shared through `vtimezone_cache` and must not be modified.
+    """
+    remove_x(vtimezone)  # Remove non standard lines from the block
+    text = str(vtimezone)  # Represent the block as a string
+    key = hashlib.sha1(text if PY2 else text.encode('utf-8')).hexdigest()
+    compiled = vtimezone_cache.get(key)
+    if compiled is None:
         fake_file = StringIO()
-        fake_file.write(str(vtimezone))  # Represent the block as a string
+        fake_file.write(text)
         fake_file.seek(0)
         timezones = tzical(fake_file)  # tzical does not like strings
         # timezones is a tzical object and could contain multiple timezones
-        for key in timezones.keys():
-            calendar._timezones[key] = timezones.get(key)
+        compiled = dict((k, timezones.get(k)) for k in timezones.keys())
+        vtimezone_cache[key] = compiled
+    return compiled
+
+
+class _ComponentPickler(pickle.Pickler):
+
+    """Pickles components with references to the time zones of a VTIMEZONE
+    registry (a TZID -> tzinfo dict) and to the registry itself: tzical
+    time zones can not be pickled, and the unpickled components must
+    share the ones of their calendar anyway."""
+
+    def __init__(self, fileobj, timezones):
+        pickle.Pickler.__init__(self, fileobj, pickle.HIGHEST_PROTOCOL)
+        self.references = dict(
+            (id(tzinfo), ('tz', tzid)) for tzid, tzinfo in timezones.items())
+        self.references[id(timezones)] = ('registry',)
+
+    def persistent_id(self, obj):
+        return self.references.get(id(obj))
+
+
+class _ComponentUnpickler(pickle.Unpickler):
+
+    """Unpickles the result of _ComponentPickler with the time zones of
+    the `timezones` registry."""
+
+    def __init__(self, fileobj, timezones):
+        pickle.Unpickler.__init__(self, fileobj)
+        self.timezones = timezones
+
+    def persistent_load(self, reference):
+        if reference[0] == 'tz':
+            return self.timezones[reference[1]]
+        return self.timezones
+
+
+def _parse_components(chunk, vtimezones, lazy):
+    """Parses the VEVENT and VTODO blocks of `chunk` (bytes) in a worker
+    of Calendar.from_file().
+
+    Returns:
+        bytes: the list of components, see _ComponentPickler
+    """
+    timezones = {}
+    for vtimezone in vtimezones:
+        timezones.update(_compile_vtimezone(bytes_to_container(vtimezone)[0]))
+    components = []
+    for container in bytes_to_container(chunk):
+        factory = Event if container.name == 'VEVENT' else Todo
+        components.append(
+            factory._from_container(container, tz=timezones, lazy=lazy))
+    result = io.BytesIO()
+    _ComponentPickler(result, timezones).dump(components)
+    return result.getvalue()
+
+
+def _load_file(path, lazy=False, pickled=False):
+    """Loads a calendar for load_many().
+
+    If `pickled`, returns the calendar pickled by _ComponentPickler and
+    the VTIMEZONE blocks to compile its time zones from, so that it can
+    be sent back by a worker process.
+    """
+    with io.open(path, 'rb') as fileobj:
+        data = fileobj.read()
+    calendar = Calendar(data.decode('utf-8'), lazy=lazy)
+    if not pickled:
+        return calendar
+    result = io.BytesIO()
+    _ComponentPickler(result, calendar._timezones).dump(calendar)
+    return result.getvalue(), _VTIMEZONE_RE.findall(data)
+
+
+def _unpickle_calendar(result):
+    """Returns the calendar pickled by _load_file(), with time zones
+    compiled (and cached, see vtimezone_cache) by the calling process."""
+    pickled, vtimezones = result
+    timezones = {}
+    for vtimezone in vtimezones:
+        timezones.update(_compile_vtimezone(bytes_to_container(vtimezone)[0]))
+    return _ComponentUnpickler(io.BytesIO(pickled), timezones).load()
+
+
+def load_many(paths, executor=None, lazy=False, stats=None):
+    """Loads many iCalendar files, concurrently if an `executor` is given.
+
+    A file which can not be loaded does not stop the others: the
+    exception is yielded instead of the calendar.
+    Compiled VTIMEZONE blocks are shared through `vtimezone_cache`: by
+    every file with a thread pool, and with a process pool by every file
+    too since the time zones are compiled back by the calling process.
+
+    Args:
+        paths (iterable): paths of files encoded in UTF-8
+        executor (concurrent.futures.Executor): runs the loads, None to\
+        load the files one after the other in the calling thread
+        lazy (bool): see :class:`Calendar`
+        stats (dict): if given, updated after each file with the number\
+        of `files`, `errors` and `bytes` loaded, the elapsed `seconds`\
+        and the throughput in `files_per_second` and `bytes_per_second`
+
+    Yields:
+        tuple: (path, :class:`Calendar` or exception), in the order in\
+        which the files are loaded
+    """
+    if stats is None:
+        stats = {}
+    stats.update(files=0, errors=0, bytes=0, seconds=0.,
+                 files_per_second=0., bytes_per_second=0.)
+    start = time.time()
+
+    def loaded(path, result, failed):
+        stats['files'] += 1
+        stats['errors'] += failed
+        try:
+            stats['bytes'] += os.path.getsize(path)
+        except OSError:
+            pass
+        seconds = stats['seconds'] = time.time() - start
+        if seconds > 0:
+            stats['files_per_second'] = stats['files'] / seconds
+            stats['bytes_per_second'] = stats['bytes'] / seconds
+        return path, result
+
+    if executor is None:
+        for path in paths:
+            try:
+                result = _load_file(path, lazy)
+            except Exception as e:
+                yield loaded(path, e, True)
+            else:
+                yield loaded(path, result, False)
+        return
+
+    pickled = ProcessPoolExecutor is not None and \
+        isinstance(executor, ProcessPoolExecutor)
+    futures = dict((executor.submit(_load_file, path, lazy, pickled), path)
+                   for path in paths)
+    for future in as_completed(futures):
+        path = futures.pop(future)
+        try:
+            result = future.result()
+            if pickled:
+                result = _unpickle_calendar(result)
+        except Exception as e:
+            yield loaded(path, e, True)
+        else:
+            yield loaded(path, result, False)
 
 
 @Calendar._extracts('VEVENT', multiple=True)
 def events(calendar, lines):
     # tz=calendar._timezones gives access to the event factory to the
     # timezones list
-    event_factory = lambda x: Event._from_container(x, tz=calendar._timezones)
+    event_factory = lambda x: Event._from_container(
+        x, tz=calendar._timezones, lazy=calendar._lazy)
     calendar.events = list(map(event_factory, lines))
 
 
@@ -303,7 +665,8 @@ def events(calendar, lines):
 def todos(calendar, lines):
     # tz=calendar._timezones gives access to the todo factory to the
     # timezones list
-    todo_factory = lambda x: Todo._from_container(x, tz=calendar._timezones)
+    todo_factory = lambda x: Todo._from_container(
+        x, tz=calendar._timezones, lazy=calendar._lazy)
     calendar.todos = list(map(todo_factory, lines))
 
 
@@ -336,11 +699,10 @@ def o_method(calendar, container):
 
 @Calendar._outputs
 def o_events(calendar, container):
-    for event in calendar.events:
-        container.append(str(event))
+    # Events are serialized by the container only when needed
+    container.extend(calendar.events)
 
 
 @Calendar._outputs
 def o_todos(calendar, container):
-    for todo in calendar.todos:
-        container.append(str(todo))
+    container.extend(calendar.todos)
@@ -0,0 +1,565 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals, absolute_import
+
+from six import PY2, PY3, StringIO, string_types, text_type, integer_types
+from six.moves import filter, map, range
+
+from arrow.arrow import Arrow
+import arrow
+from array import array
+from bisect import bisect_left, bisect_right
+import io
+import mmap
+import os
+import struct
+import sys
+
+from .event import Event
+from .eventlist import _matches, _select
+from .todo import Todo
+from .icalendar import _compile_vtimezone, _COMPONENT_RE, _VTIMEZONE_RE
+from .parse import bytes_to_container
+from .utils import epoch_to_timestamp, get_arrow, LRUCache
+
+
+# Sidecar index of an iCalendar file: the byte ranges of its VEVENT, VTODO
+# and VTIMEZONE blocks, with the uid, begin and end of each component.
+#
+# Header (little-endian): magic, size and mtime (microseconds) of the
+# indexed file, number of components, of VTODO, of VTIMEZONE blocks, size
+# of the uids, number of sorted events and of recurring events.
+# Then columns of int64 (little-endian):
+# - offsets, lengths, types, begins and ends of the components,
+# - offsets of their uids in the uids (one more),
+# - positions of the components sorted by uid,
+# - positions of the non recurring events with a begin, sorted by begin,
+# - min and max end of each block of BLOCK_SIZE of these sorted events,
+# - positions of the recurring events,
+# - offsets and lengths of the VTIMEZONE blocks.
+# Then the UTF-8 uids, concatenated.
+MAGIC = b'ICSIDX02'
+_HEADER = struct.Struct(str('<8s8q'))
+
+# Begin or end of a component which has none
+MISSING = -2 ** 63
+
+BLOCK_SIZE = 64
+
+_TYPES = ('VEVENT', 'VTODO')
+_FACTORIES = (Event, Todo)
+
+
+def _int64_typecode():
+    # 'q' is missing on python 2, where 'l' has 8 bytes on 64-bit Unix
+    for typecode in ('q', 'l'):
+        try:
+            if array(typecode).itemsize == 8:
+                return typecode
+        except ValueError:
+            pass
+    raise ImportError('ics.index requires 8 bytes integer arrays')
+
+
+_INT64 = _int64_typecode()
+
+# The columns are read in place from the mapped index when possible
+_CAST = PY3 and sys.byteorder == 'little'
+
+
+def _write_column(fileobj, values):
+    column = array(_INT64, values)
+    if sys.byteorder == 'big':
+        column.byteswap()
+    fileobj.write(column.tostring() if PY2 else column.tobytes())
+
+
+def _stat(path):
+    stat = os.stat(path)
+    return stat.st_size, int(stat.st_mtime * 1000000)
+
+
+def _map(fileobj):
+    """Returns a read only mmap of `fileobj`, or b'' if it is empty."""
+    if os.fstat(fileobj.fileno()).st_size == 0:
+        return b''
+    return mmap.mmap(fileobj.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _unmap(data):
+    if not isinstance(data, bytes):
+        data.close()
+
+
+def _parse(source, offset, length):
+    """Returns the Container of the block at [offset, offset + length)."""
+    return bytes_to_container(source, offset, offset + length)[0]
+
+
+def _instants(component):
+    """Returns the (begin, end) of `component` in UTC microseconds since
+    the epoch, MISSING if it has none."""
+    if isinstance(component, Event):
+        timestamps = component._timestamps()
+        if timestamps is None:
+            return MISSING, MISSING
+        return tuple(int(round(t * 1000000)) for t in timestamps)
+    if component._due_epoch is None:
+        return MISSING, MISSING
+    due = epoch_to_timestamp(component._due_epoch, component._due_tz)
+    return MISSING, int(round(due * 1000000))
+
+
+def _epoch(instant):
+    """Returns an Arrow `instant` (or None) in UTC microseconds, rounded
+    like _instants()."""
+    if instant is None:
+        return None
+    return int(round(instant.float_timestamp * 1000000))
+
+
+def default_path(path):
+    """Returns the path of the index of the file at `path`."""
+    return path + '.idx'
+
+
+def build(path, index_path=None):
+    """Indexes the VEVENT and VTODO blocks of the iCalendar file at
+    `path`, to load them one at a time with :class:`Index`.
+
+    Every component is parsed once, with the VTIMEZONE blocks of the file.
+    The begin and end of a recurring event are the ones of its first
+    occurrence.
+
+    Args:
+        path (string): path of the file, encoded in UTF-8
+        index_path (string): path of the index, see default_path()
+
+    Returns:
+        string: the path of the index
+    """
+    index_path = index_path or default_path(path)
+    offsets, lengths, types, begins, ends, uids = [], [], [], [], [], []
+    recurring, tz_offsets, tz_lengths = [], [], []
+    with io.open(path, 'rb') as fileobj:
+        source = _map(fileobj)
+        try:
+            timezones = {}
+            for match in _VTIMEZONE_RE.finditer(source):
+                offset, end = match.span()
+                tz_offsets.append(offset)
+                tz_lengths.append(end - offset)
+                timezones.update(
+                    _compile_vtimezone(_parse(source, offset, end - offset)))
+
+            for match in _COMPONENT_RE.finditer(source):
+                offset, end = match.span()
+                container = _parse(source, offset, end - offset)
+                uid = ''
+                for line in container:
+                    if line.name == 'UID':
+                        uid = line.value
+                kind = _TYPES.index(container.name)
+                component = _FACTORIES[kind]._from_container(
+                    container, tz=timezones)
+                begin, end_instant = _instants(component)
+                if kind == 0 and component.is_recurring():
+                    recurring.append(len(offsets))
+                offsets.append(offset)
+                lengths.append(end - offset)
+                types.append(kind)
+                begins.append(begin)
+                ends.append(end_instant)
+                uids.append(uid.encode('utf-8'))
+        finally:
+            _unmap(source)
+
+    uid_offsets = [0]
+    for uid in uids:
+        uid_offsets.append(uid_offsets[-1] + len(uid))
+    order = sorted(range(len(uids)), key=uids.__getitem__)
+    excluded = set(recurring)
+    by_begin = sorted(
+        (position for position in range(len(uids)) if types[position] == 0
+         and begins[position] != MISSING and position not in excluded),
+        key=lambda position: (begins[position], ends[position], position))
+    blocks = [[ends[position] for position in by_begin[i:i + BLOCK_SIZE]]
+              for i in range(0, len(by_begin), BLOCK_SIZE)]
+
+    size, mtime = _stat(path)
+    with io.open(index_path, 'wb') as fileobj:
+        fileobj.write(_HEADER.pack(MAGIC, size, mtime, len(uids), sum(types),
+                                   len(tz_offsets), uid_offsets[-1],
+                                   len(by_begin), len(recurring)))
+        for column in (offsets, lengths, types, begins, ends, uid_offsets,
+                       order, by_begin, map(min, blocks), map(max, blocks),
+                       recurring, tz_offsets, tz_lengths):
+            _write_column(fileobj, column)
+        fileobj.write(b''.join(uids))
+    return index_path
+
+
+class _Uids(object):
+
+    """The uids of an index sorted by value, as a sequence for bisect."""
+
+    def __init__(self, index):
+        self.index = index
+
+    def __len__(self):
+        return len(self.index)
+
+    def __getitem__(self, i):
+        return self.index._uid(self.index.order[i])
+
+
+class _SortedBegins(object):
+
+    """The begins of the sorted events of an index, as a sequence for
+    bisect."""
+
+    def __init__(self, index):
+        self.index = index
+
+    def __len__(self):
+        return len(self.index.by_begin)
+
+    def __getitem__(self, i):
+        return self.index.begins[self.index.by_begin[i]]
+
+
+class Index(object):
+
+    """Random access to the components of an iCalendar file, with the
+    index written by :func:`build`.
+
+    The file and its index are mapped in memory (mmap): the columns are
+    read in place on python 3 and a component is only parsed when it is
+    requested.
+    """
+
+    def __init__(self, path, index_path=None, lazy=False):
+        """
+        Args:
+            path (string): path of the indexed file
+            index_path (string): path of the index, see default_path()
+            lazy (bool): see :class:`ics.icalendar.Calendar`
+
+        Raises:
+            ValueError: if the index is invalid or older than the file
+        """
+        index_path = index_path or default_path(path)
+        with io.open(index_path, 'rb') as fileobj:
+            data = _map(fileobj)
+        if len(data) < _HEADER.size or data[:len(MAGIC)] != MAGIC:
+            _unmap(data)
+            raise ValueError('{} is not an index'.format(index_path))
+        (_, size, mtime, count, self.todo_count, tz_count, uids_size,
+         sorted_count, recurring_count) = _HEADER.unpack(
+            data[:_HEADER.size])
+        blocks = (sorted_count + BLOCK_SIZE - 1) // BLOCK_SIZE
+        lengths = (count, count, count, count, count, count + 1, count,
+                   sorted_count, blocks, blocks, recurring_count,
+                   tz_count, tz_count)
+        if (size, mtime) != _stat(path):
+            _unmap(data)
+            raise ValueError('The index of {} is outdated'.format(path))
+        if len(data) != _HEADER.size + 8 * sum(lengths) + uids_size:
+            _unmap(data)
+            raise ValueError('{} is truncated'.format(index_path))
+
+        self._data = data
+        self._views = []
+        self._base = memoryview(data) if _CAST else None
+        offset = _HEADER.size
+        columns = []
+        for length in lengths:
+            columns.append(self._column(offset, offset + length * 8))
+            offset += length * 8
+        (self.offsets, self.lengths, self.types, self.begins, self.ends,
+         self.uid_offsets, self.order, self.by_begin, self.block_min_ends,
+         self.block_max_ends, self.recurring, self.tz_offsets,
+         self.tz_lengths) = columns
+        self._uids_offset = offset
+
+        self.lazy = lazy
+        self._file = io.open(path, 'rb')
+        self.source = _map(self._file)
+        self._timezones = None
+
+    def _column(self, offset, end):
+        if _CAST:
+            view = self._base[offset:end].cast(str('q'))
+            self._views.append(view)
+            return view
+        column = array(_INT64)
+        if PY2:
+            column.fromstring(self._data[offset:end])
+        else:
+            column.frombytes(self._data[offset:end])
+        if sys.byteorder == 'big':
+            column.byteswap()
+        return column
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        # The index can only be unmapped once its views are released
+        for view in self._views:
+            view.release()
+        if self._base is not None:
+            self._base.release()
+        _unmap(self._data)
+        _unmap(self.source)
+        self._file.close()
+
+    def _uid(self, position):
+        offset = self._uids_offset
+        return self._data[offset + self.uid_offsets[position]:
+                          offset + self.uid_offsets[position + 1]]
+
+    def uid(self, position):
+        """Returns the uid of the component at `position`."""
+        return self._uid(position).decode('utf-8')
+
+    def positions(self, uid):
+        """Returns the sorted positions of the components with this `uid`,
+        in O(log n)."""
+        uid = uid.encode('utf-8')
+        uids = _Uids(self)
+        lo = bisect_left(uids, uid)
+        hi = bisect_right(uids, uid, lo)
+        return [self.order[i] for i in range(lo, hi)]
+
+    def position(self, uid):
+        """Returns the position of the first component with this `uid`
+        in the file, or None. Runs in O(log n)."""
+        uid = uid.encode('utf-8')
+        i = bisect_left(_Uids(self), uid)
+        if i < len(self) and self._uid(self.order[i]) == uid:
+            return self.order[i]
+        return None
+
+    def sorted_range(self, lo=None, hi=None, closed=False):
+        """Returns the bounds of the indexes in `by_begin` of the sorted
+        events with lo < begin < hi (lo <= begin <= hi if `closed`)."""
+        begins = _SortedBegins(self)
+        start = 0 if lo is None else \
+            (bisect_left if closed else bisect_right)(begins, lo)
+        stop = len(begins) if hi is None else \
+            (bisect_right if closed else bisect_left)(begins, hi)
+        return start, stop
+
+    def scan(self, start, stop, block_test, test):
+        """Returns the positions of the sorted events of by_begin[start:stop]
+        for which test(begin, end) holds, skipping the blocks for which
+        block_test(min_end, max_end) does not."""
+        by_begin, begins, ends = self.by_begin, self.begins, self.ends
+        positions = []
+        for block in range(start // BLOCK_SIZE,
+                           (stop + BLOCK_SIZE - 1) // BLOCK_SIZE):
+            if not block_test(self.block_min_ends[block],
+                              self.block_max_ends[block]):
+                continue
+            for i in range(max(start, block * BLOCK_SIZE),
+                           min(stop, (block + 1) * BLOCK_SIZE)):
+                position = by_begin[i]
+                if test(begins[position], ends[position]):
+                    positions.append(position)
+        return positions
+
+    @property
+    def timezones(self):
+        """The VTIMEZONE registry of the file, compiled on first use."""
+        if self._timezones is None:
+            timezones = {}
+            for offset, length in zip(self.tz_offsets, self.tz_lengths):
+                timezones.update(
+                    _compile_vtimezone(_parse(self.source, offset, length)))
+            self._timezones = timezones
+        return self._timezones
+
+    def component(self, position):
+        """Parses the component at `position`.
+
+        Returns:
+            :class:`ics.event.Event` or :class:`ics.todo.Todo`
+        """
+        container = _parse(self.source, self.offsets[position],
+                           self.lengths[position])
+        return _FACTORIES[self.types[position]]._from_container(
+            container, tz=self.timezones, lazy=self.lazy)
+
+    def get(self, uid, default=None):
+        """Returns the component with this `uid`, or `default`."""
+        position = self.position(uid)
+        if position is None:
+            return default
+        return self.component(position)
+
+
+class LazyEventList(object):
+
+    """Read only :class:`ics.eventlist.EventList` of the events of an
+    indexed file, which only keeps the `maxsize` events used last.
+
+    The events are described by the columns of the :class:`Index` (byte
+    range, uid, begin and end) and parsed on demand: len(), iteration,
+    time slices, :meth:`at` and :meth:`get` never load the whole file.
+
+    Changes to the returned events are not written to the file and are
+    lost once the events leave the cache.
+    """
+
+    def __init__(self, index, maxsize=1024):
+        """
+        Args:
+            index (Index)
+            maxsize (int): maximum number of parsed events kept
+        """
+        self.index = index
+        self.cache = LRUCache(maxsize=maxsize)
+        if index.todo_count:
+            self.positions = array(_INT64, (
+                position for position in range(len(index))
+                if index.types[position] == 0))
+        else:
+            self.positions = range(len(index))
+
+    def _event(self, position, cache=True):
+        """Returns the event at `position` in the file."""
+        event = self.cache.get(position)
+        if event is None:
+            event = self.index.component(position)
+            if cache:
+                self.cache[position] = event
+        return event
+
+    def __len__(self):
+        return len(self.positions)
+
+    def __iter__(self):
+        # Caching every event would only evict the ones used last
+        for position in self.positions:
+            yield self._event(position, cache=False)
+
+    def __getitem__(self, sl):
+        """Same slices as :meth:`ics.eventlist.EventList.__getitem__`."""
+        if isinstance(sl, integer_types):
+            return self._event(self.positions[sl])
+
+        if not isinstance(sl, slice):  # A day
+            begin, end = get_arrow(sl).floor('day').span('day')
+            return self[begin:end:'both']
+
+        int_or_none = integer_types + (type(None), )
+        if isinstance(sl.start, int_or_none) \
+            and isinstance(sl.stop, int_or_none) \
+                and isinstance(sl.step, int_or_none):
+            return [self._event(self.positions[i])
+                    for i in range(*sl.indices(len(self)))]
+
+        step = 'both' if sl.step is None else sl.step
+        if step not in ('begin', 'end', 'both', 'any', 'inc'):
+            raise ValueError(
+                "The step must be 'begin', 'end', 'both', 'any', 'inc' \
+or None not '{}'".format(sl.step))
+
+        begin, end = get_arrow(sl.start), get_arrow(sl.stop)
+        if step == 'inc' and (not begin or not end):
+            return []
+        start, stop = _epoch(begin), _epoch(end)
+
+        index = self.index
+        if step == 'begin':  # start < begin < stop
+            lo, hi = index.sorted_range(start, stop)
+            positions = [index.by_begin[i] for i in range(lo, hi)]
+        elif step == 'end':  # start < end < stop
+            positions = index.scan(
+                0, len(index.by_begin),
+                lambda min_end, max_end: (start is None or max_end > start)
+                and (stop is None or min_end < stop),
+                lambda b, e: (start is None or e > start) and
+                (stop is None or e < stop))
+        elif step == 'both':  # start < begin <= end < stop
+            lo, hi = index.sorted_range(start, stop)
+            positions = index.scan(
+                lo, hi, lambda min_end, max_end: stop is None or min_end < stop,
+                lambda b, e: stop is None or e < stop)
+        elif step == 'any':  # begin < stop and start < end
+            lo, hi = index.sorted_range(None, stop)
+            positions = index.scan(
+                lo, hi,
+                lambda min_end, max_end: start is None or max_end > start,
+                lambda b, e: start is None or e > start)
+        else:  # begin < start and stop < end
+            lo, hi = index.sorted_range(None, start)
+            positions = index.scan(
+                lo, hi, lambda min_end, max_end: max_end > stop,
+                lambda b, e: e > stop)
+
+        start = begin.float_timestamp if begin else None
+        stop = end.float_timestamp if end else None
+        return _select(
+            self._event, positions, self.index.recurring, begin, end,
+            lambda occurrence: _matches(occurrence, start, stop, step))
+
+    def today(self, strict=False):
+        """See :meth:`ics.eventlist.EventList.today`."""
+        return self[arrow.now()]
+
+    def on(self, day, strict=False):
+        """See :meth:`ics.eventlist.EventList.on`."""
+        if not isinstance(day, Arrow):
+            day = arrow.get(day)
+        return self[day]
+
+    def now(self):
+        """See :meth:`ics.eventlist.EventList.now`."""
+        return self.at(arrow.now())
+
+    def at(self, instant):
+        """See :meth:`ics.eventlist.EventList.at`."""
+        instant = get_arrow(instant)
+        microseconds = _epoch(instant)
+        timestamp = instant.float_timestamp
+
+        def matches(event):
+            timestamps = event._timestamps()
+            return timestamps is not None and \
+                timestamps[0] <= timestamp <= timestamps[1]
+
+        lo, hi = self.index.sorted_range(None, microseconds, closed=True)
+        positions = self.index.scan(
+            lo, hi, lambda min_end, max_end: max_end >= microseconds,
+            lambda b, e: e >= microseconds)
+        return _select(self._event, positions, self.index.recurring,
+                       instant, instant, matches)
+
+    def concurrent(self, event):
+        """See :meth:`ics.eventlist.EventList.concurrent`."""
+        return list(set(self[event.begin:event.end:'any']))
+
+    def get(self, uid, default=None):
+        """Returns the first event with the given `uid`, in O(log n)."""
+        for position in self.index.positions(uid):
+            if self.index.types[position] == 0:
+                return self._event(position)
+        return default
+
+    def __contains__(self, item):
+        """`item` may be an event or an uid."""
+        if isinstance(item, Event):
+            item = item.uid
+        return self.get(item) is not None
+
+    def __repr__(self):
+        return str("<LazyEventList of {} events>".format(len(self)))
@@ -6,6 +6,17 @@ from six import PY2, PY3
 from six.moves import filter, map, range
 
 import collections
+import re
+
+# Number of characters (or octets) read at once by the streaming parsers
+CHUNK_SIZE = 64 * 1024
+
+
+# A parameter: ;NAME=VALUE[,VALUE…] where each VALUE may be DQUOTE-d and
+# then contain ':', ';' and ','
+_PARAM_RE = re.compile(r';([^;:=]*)=((?:"[^"]*"|[^";:])*)')
+_PARAM_VALUE_RE = re.compile(r'"[^"]*"|[^",]*')
+_UNSAFE_PARAM_VALUE_RE = re.compile(r'[:;,]')
 
 
 class ParseError(Exception):
@@ -30,7 +41,8 @@ class ContentLine:
     def __str__(self):
         params_str = ''
         for pname in self.params:
-            params_str += ';{}={}'.format(pname, ','.join(self.params[pname]))
+            pvals = map(_quote_param_value, self.params[pname])
+            params_str += ';{}={}'.format(pname, ','.join(pvals))
         ret = "{}{}:{}".format(self.name, params_str, self.value)
         return ret.encode('utf-8') if PY2 else ret
 
@@ -51,32 +63,69 @@ class ContentLine:
 
     @classmethod
     def parse(cls, line):
-        if ':' not in line:
+        colon = line.find(':')
+        if colon == -1:
             raise ParseError("No ':' in line '{}'".format(line))
 
-        # Separe key and value
-        splitted = line.split(':')
-        key, value = splitted[0], ':'.join(splitted[1:]).strip()
-
-        # Separe name and params
-        splitted = key.split(';')
-        name, params_strings = splitted[0], splitted[1:]
+        semicolon = line.find(';', 0, colon)
+        if semicolon == -1:  # No parameter, most common case
+            return cls(line[:colon], {}, line[colon + 1:].strip())
 
-        # Separe key and values for params
         params = {}
-        for paramstr in params_strings:
-            if '=' not in paramstr:
+        if line.find('"', semicolon, colon) == -1:
+            # No quoted parameter value: `colon` ends the parameters
+            for paramstr in line[semicolon + 1:colon].split(';'):
+                pname, equal, pvals = paramstr.partition('=')
+                if not equal:
+                    raise ParseError("No '=' in line '{}'".format(line))
+                params[pname] = pvals.split(',')
+            return cls(line[:semicolon], params, line[colon + 1:].strip())
+
+        # A quoted parameter value may contain ':' and ';': scan the
+        # parameters one after the other to find where the value starts
+        pos = semicolon
+        while line.startswith(';', pos):
+            match = _PARAM_RE.match(line, pos)
+            if match is None:
                 raise ParseError("No '=' in line '{}'".format(line))
-            splitted = paramstr.split('=')
-            pname, pvals = splitted[0], '='.join(splitted[1:])
-            params[pname] = pvals.split(',')
-        return cls(name, params, value)
+            pname, pvals = match.groups()
+            params[pname] = _split_param_values(pvals, line)
+            pos = match.end()
+
+        if not line.startswith(':', pos):
+            raise ParseError("No ':' after parameters in line '{}'"
+                             .format(line))
+        return cls(line[:semicolon], params, line[pos + 1:].strip())
 
     def clone(self):
         # dict(self.params) -> Make a copy of the dict
         return self.__class__(self.name, dict(self.params), self.value)
 
 
+def _split_param_values(pvals, line):
+    """Splits a parameter value on ',' and removes the DQUOTEs
+    around quoted values."""
+    if '"' not in pvals:
+        return pvals.split(',')
+
+    values, pos = [], 0
+    while True:
+        value = _PARAM_VALUE_RE.match(pvals, pos).group()
+        pos += len(value)
+        values.append(value[1:-1] if value.startswith('"') else value)
+        if pos >= len(pvals):
+            return values
+        if pvals[pos] != ',':
+            raise ParseError("Misplaced '\"' in line '{}'".format(line))
+        pos += 1
+
+
+def _quote_param_value(value):
+    if _UNSAFE_PARAM_VALUE_RE.search(value):
+        return '"{}"'.format(value)
+    return value
+
+
 class Container(list):
 
     def __init__(self, name, *items):
@@ -117,6 +166,26 @@ class Container(list):
                 items.append(line)
         return cls(name, *items)
 
+    def iter_lines(self):
+        """Yields the unfolded lines of the container one at a time.
+
+        Items which are not ContentLines nor Containers (like components)
+        are only serialized when they are reached.
+        """
+        yield 'BEGIN:{}'.format(self.name)
+        for item in self:
+            if isinstance(item, Container):
+                for line in item.iter_lines():
+                    yield line
+            else:
+                text = str(item).decode('utf-8') if PY2 else str(item)
+                if isinstance(item, ContentLine):
+                    yield text
+                else:
+                    for line in text.split('\n'):
+                        yield line
+        yield 'END:{}'.format(self.name)
+
     def clone(self):
         c = self.__class__(self.name)
         for elem in self:
@@ -124,6 +193,46 @@ class Container(list):
         return c
 
 
+def iter_physical_lines(fileobj, chunk_size=CHUNK_SIZE):
+    """Reads `fileobj` chunk by chunk and yields its lines, without
+    the trailing '\\n'. Only one chunk is kept in memory at a time.
+    """
+    pending = ''
+    while True:
+        chunk = fileobj.read(chunk_size)
+        if not chunk:
+            break
+        lines = (pending + chunk).split('\n')
+        pending = lines.pop()  # Last line may continue in the next chunk
+        for line in lines:
+            yield line
+    if pending:
+        yield pending
+
+
+def fold_line(line, limit=75):
+    """Splits a line in physical lines of at most `limit` octets
+    once encoded in UTF-8 (a multi-octet character is never split).
+    Continuation lines start with a space.
+
+    Returns:
+        list of strings
+    """
+    octets = line.encode('utf-8')
+    if len(octets) <= limit:
+        return [line]
+
+    folded, start, size = [], 0, limit
+    while len(octets) - start > size:
+        end = start + size
+        while ord(octets[end:end + 1]) & 0xC0 == 0x80:  # Continuation octet
+            end -= 1
+        folded.append(octets[start:end].decode('utf-8'))
+        start, size = end, limit - 1  # Leave room for the leading space
+    folded.append(octets[start:].decode('utf-8'))
+    return folded[:1] + [' ' + part for part in folded[1:]]
+
+
 def unfold_lines(physical_lines):
     if not isinstance(physical_lines, collections.Iterable):
         raise ParseError('Parameter `physical_lines` must be an iterable')
@@ -143,6 +252,59 @@ def unfold_lines(physical_lines):
         yield(current_line)
 
 
+def _join(parts):
+    if len(parts) == 1:
+        return parts[0]
+    # Same type as the parts: b''.join() only takes bytes in python 2
+    return parts[0][:0].join(parts)
+
+
+def iter_unfolded_bytes(data, start=0, end=None, chunk_size=CHUNK_SIZE):
+    """Same as unfold_lines() for the UTF-8 octets of `data`, without
+    decoding or splitting it as a whole.
+
+    `data` is split chunk by chunk, at line boundaries found with its
+    `rfind()` method: only one chunk is copied out of it at a time. Lines
+    are unfolded before being decoded, so a character may be folded.
+
+    Args:
+        data (bytes, bytearray or mmap): the iCalendar data
+        start (int): offset of the first octet to read
+        end (int): offset after the last octet to read, None for the end
+        chunk_size (int): number of octets to split at once
+
+    Yields:
+        bytes: the unfolded lines, without their line break
+    """
+    end = len(data) if end is None else end
+    parts = []  # The physical lines of the current line
+    while start < end:
+        limit = min(end, start + chunk_size)
+        stop = end if limit == end else data.rfind(b'\n', start, limit) + 1
+        if stop <= start:  # Line longer than chunk_size
+            stop = data.find(b'\n', limit, end) + 1 or end
+        for line in data[start:stop].split(b'\n'):
+            if not line.strip():
+                continue
+            elif line[:1] == b' ' and parts:
+                parts.append(line[1:].strip(b'\r'))
+            else:
+                if parts:
+                    yield _join(parts)
+                parts = [line.strip(b'\r')]
+        start = stop
+    if parts:
+        yield _join(parts)
+
+
+def tokenize_bytes(unfolded_lines):
+    """Same as tokenize_line() for lines of UTF-8 octets, decoding them
+    one at a time."""
+    parse = ContentLine.parse
+    for line in unfolded_lines:
+        yield parse(line.decode('utf-8'))
+
+
 def tokenize_line(unfolded_lines):
     for line in unfolded_lines:
         yield ContentLine.parse(line)
@@ -165,6 +327,32 @@ def lines_to_container(lines):
 def string_to_container(txt):
     return lines_to_container(txt.split('\n'))
 
+
+def bytes_to_container(data, start=0, end=None):
+    """Same as string_to_container() for UTF-8 octets, see
+    iter_unfolded_bytes()."""
+    return parse(tokenize_bytes(iter_unfolded_bytes(data, start, end)))
+
+
+def iter_components(fileobj, chunk_size=CHUNK_SIZE):
+    """Streams the components of an iCalendar file.
+
+    Yields a :class:`Container` for each component (VEVENT, VTODO,
+    VTIMEZONE, …) of the calendar as soon as its END line is read, so
+    that only one component is held in memory at a time.
+    The properties of the VCALENDAR itself are skipped.
+
+    Args:
+        fileobj (file-like): object with a `read(size)` method returning text
+        chunk_size (int): number of characters to read at once
+    """
+    tokenized_lines = tokenize_line(unfold_lines(
+        iter_physical_lines(fileobj, chunk_size)))
+    for line in tokenized_lines:
+        if line.name == 'BEGIN' and line.value != 'VCALENDAR':
+            yield Container.parse(line.value, tokenized_lines)
+
+
 if __name__ == "__main__":
     from tests.fixture import cal1
 
@@ -0,0 +1,335 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals, absolute_import
+
+from six import PY2, PY3, StringIO, string_types, text_type, integer_types
+from six.moves import filter, map, range
+
+import heapq
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+
+from dateutil.rrule import rrulestr
+
+try:
+    import numpy
+except ImportError:  # numpy is only needed by the *_array() functions
+    numpy = None
+
+from .utils import ical_to_arrow, naive_to_epoch, utc_offset, LRUCache
+
+
+# Expanded windows of recurrence sets, keyed by a fingerprint of the set
+# (see expand_window()). A value is a list of disjoint (lo, hi, occurrences)
+# segments sorted by lo: `occurrences` are all the occurrences between lo
+# and hi. Entries are replaced, never modified.
+occurrence_cache = LRUCache(maxsize=1024)
+
+# Larger segments are not cached
+MAX_CACHED_OCCURRENCES = 2048
+
+
+def _format_naive(dt):
+    # strftime() does not support years before 1900 in python2
+    return '%04d%02d%02dT%02d%02d%02d' % (
+        dt.year, dt.month, dt.day, dt.hour, dt.minute, dt.second)
+
+
+def parse_rrule(value, dtstart, tzinfo):
+    """Parses a RRULE value into a lazy dateutil rrule.
+
+    Args:
+        value (string): the RRULE value, like FREQ=DAILY;COUNT=10
+        dtstart (datetime): naive wall time of the first occurrence
+        tzinfo (tzinfo): time zone of dtstart
+
+    Returns:
+        rrule: yields the naive wall times of the occurrences
+
+    Raises:
+        ValueError: if `value` is not a valid RRULE
+    """
+    parts = []
+    for part in value.split(';'):
+        name, _, until = part.partition('=')
+        if name.upper() == 'UNTIL' and until[-1:] in ('Z', 'z'):
+            # UTC bound: convert it to the wall time of the occurrences
+            instant = ical_to_arrow(until)
+            if instant is not None:
+                until = _format_naive(instant.to(tzinfo).naive)
+                part = 'UNTIL=' + until
+        parts.append(part)
+    return rrulestr(';'.join(parts), dtstart=dtstart)
+
+
+def is_finite(rrules):
+    """Returns True if none of the RRULE values `rrules` is infinite."""
+    for value in rrules:
+        names = [part.partition('=')[0].upper() for part in value.split(';')]
+        if 'COUNT' not in names and 'UNTIL' not in names:
+            return False
+    return True
+
+
+def iter_recurrence(dtstart, rules, rdates=(), exdates=()):
+    """Yields the sorted and unique naive wall times of a recurrence set.
+
+    The series are merged lazily: an infinite rule can be iterated until
+    the caller stops.
+
+    Args:
+        dtstart (datetime): always the first occurrence
+        rules (list): iterables of datetimes in ascending order, like rrules
+        rdates (iterable): additional datetimes
+        exdates (iterable): excluded datetimes
+    """
+    series = [iter(rule) for rule in rules]
+    series.append(iter(sorted(set(rdates) | set([dtstart]))))
+    exdates = sorted(exdates)
+    excluded = 0
+    previous = None
+    for dt in heapq.merge(*series):
+        if dt == previous:
+            continue
+        previous = dt
+        while excluded < len(exdates) and exdates[excluded] < dt:
+            excluded += 1
+        if excluded < len(exdates) and exdates[excluded] == dt:
+            continue
+        yield dt
+
+
+def expand_window(key, factory, lo=None, hi=None, tzinfo=None):
+    """Returns the sorted occurrences of a recurrence set between `lo` and
+    `hi` (included), from occurrence_cache when possible.
+
+    The cached windows overlapping [lo, hi] are merged with it: only the
+    occurrences which are not cached yet are kept from the expansion.
+
+    Args:
+        key: fingerprint of the recurrence set: it must change when the
+            set changes (first occurrence, rules or exceptions)
+        factory (callable): returns an iterator over the occurrences of
+            the set, like iter_recurrence()
+        lo (datetime): lower bound or None
+        hi (datetime): upper bound or None (the set must then be finite)
+        tzinfo (tzinfo): time zone of the occurrences, checked on hit as
+            the key may contain its id()
+    """
+    lo = datetime.min if lo is None else lo
+    hi = datetime.max if hi is None else hi
+
+    cached = occurrence_cache.get(key)
+    segments = cached[1] if cached and cached[0] is tzinfo else []
+    overlapping, others = [], []
+    for segment in segments:
+        if segment[1] < lo or segment[0] > hi:
+            others.append(segment)
+        else:
+            overlapping.append(segment)
+
+    if len(overlapping) == 1 and overlapping[0][0] <= lo \
+            and hi <= overlapping[0][1]:  # Hit
+        occurrences = overlapping[0][2]
+    else:
+        merged_lo = min([lo] + [segment[0] for segment in overlapping])
+        merged_hi = max([hi] + [segment[1] for segment in overlapping])
+        occurrences = []
+        for segment in overlapping:
+            occurrences.extend(segment[2])
+        # Only keep the occurrences in the gaps between the segments
+        i = 0
+        for dt in factory():
+            if dt > merged_hi:
+                break
+            while i < len(overlapping) and overlapping[i][1] < dt:
+                i += 1
+            if dt >= merged_lo and (i == len(overlapping) or
+                                    dt < overlapping[i][0]):
+                occurrences.append(dt)
+        occurrences.sort()
+        if len(occurrences) <= MAX_CACHED_OCCURRENCES:
+            others.append((merged_lo, merged_hi, occurrences))
+            others.sort(key=lambda segment: segment[0])
+        occurrence_cache[key] = (tzinfo, others)
+
+    return occurrences[bisect_left(occurrences, lo):
+                       bisect_right(occurrences, hi)]
+
+
+# Vectorized expansion (requires numpy). Instants are int64 numbers of
+# microseconds since the epoch (see utils.arrow_to_epoch()).
+
+_DAY = 86400 * 1000000
+_WEEKDAYS = {'MO': 0, 'TU': 1, 'WE': 2, 'TH': 3, 'FR': 4, 'SA': 5, 'SU': 6}
+_SIMPLE_PARTS = ('FREQ', 'INTERVAL', 'COUNT', 'UNTIL', 'BYDAY', 'WKST')
+
+
+def _simple_rrule(value):
+    """Returns the parts of a RRULE value as a dict if rrule_array() can
+    expand it, None otherwise."""
+    parts = {}
+    for part in value.split(';'):
+        name, _, part_value = part.partition('=')
+        parts[name.upper()] = part_value.upper()
+    if any(name not in _SIMPLE_PARTS for name in parts) \
+            or parts.get('WKST', 'MO') != 'MO':
+        return None
+    freq = parts.get('FREQ')
+    if freq not in ('DAILY', 'WEEKLY', 'MONTHLY', 'YEARLY'):
+        return None
+    if 'BYDAY' in parts and (
+            freq not in ('DAILY', 'WEEKLY') or
+            any(day not in _WEEKDAYS for day in parts['BYDAY'].split(','))):
+        return None
+    if not parts.get('INTERVAL', '1').isdigit() or \
+            not parts.get('COUNT', '0').isdigit():
+        return None
+    return parts
+
+
+def _weekdays(instants):
+    return (instants // _DAY + 3) % 7  # 1970-01-01 was a thursday
+
+
+def rrule_array(value, dtstart, tzinfo, hi):
+    """Vectorized parse_rrule() for the simple rules: FREQ=DAILY, WEEKLY,
+    MONTHLY or YEARLY with INTERVAL, COUNT, UNTIL, and BYDAY weekdays for
+    DAILY and WEEKLY rules.
+
+    Args:
+        value (string): the RRULE value
+        dtstart (int): wall time of the first occurrence
+        tzinfo (tzinfo): time zone of dtstart
+        hi (int): upper bound (included) of the wall times to expand
+
+    Returns:
+        numpy.ndarray: the sorted wall times of the occurrences <= `hi`,
+        or None if the rule is not simple
+    """
+    parts = _simple_rrule(value)
+    if parts is None:
+        return None
+    freq = parts['FREQ']
+    interval = max(int(parts.get('INTERVAL', 1)), 1)
+
+    until = parts.get('UNTIL')
+    if until:
+        instant = ical_to_arrow(until)
+        if instant is None:
+            return None
+        if until[-1:] == 'Z':  # Like parse_rrule()
+            instant = instant.to(tzinfo)
+        hi = min(hi, naive_to_epoch(instant.naive))
+    if hi < dtstart:
+        return numpy.zeros(0, dtype=numpy.int64)
+
+    count = int(parts.get('COUNT', 0))
+    # With a COUNT, fewer periods have to be expanded: at least one period
+    # in 8 has an occurrence (the worst case being february 29th)
+    max_periods = count * 8 + 16 if count else None
+
+    def periods(last_period):
+        if max_periods is None:
+            return last_period + 1
+        return min(last_period + 1, max_periods)
+
+    if freq in ('DAILY', 'WEEKLY'):
+        step = interval * _DAY * (1 if freq == 'DAILY' else 7)
+        byday = sorted(set(_WEEKDAYS[day] for day in
+                           parts.get('BYDAY', '').split(',') if day))
+        if byday and freq == 'WEEKLY':
+            # Every BYDAY of the weeks (starting on monday) of the rule
+            first = dtstart - int(_weekdays(dtstart)) * _DAY
+            weeks = numpy.arange(periods((hi - first) // step),
+                                 dtype=numpy.int64)
+            offsets = numpy.array(byday, dtype=numpy.int64) * _DAY
+            candidates = (first + weeks[:, None] * step +
+                          offsets[None, :]).ravel()
+        else:
+            candidates = dtstart + numpy.arange(
+                periods((hi - dtstart) // step), dtype=numpy.int64) * step
+            if byday:
+                candidates = candidates[
+                    numpy.isin(_weekdays(candidates), byday)]
+    else:
+        # The occurrences are on the day of dtstart in every MONTHLY or
+        # YEARLY period, months without that day are skipped
+        first_day = numpy.datetime64(dtstart // _DAY, 'D')
+        first_month = first_day.astype('datetime64[M]')
+        day = (first_day - first_month.astype('datetime64[D]')).astype(int)
+        step = interval * (1 if freq == 'MONTHLY' else 12)
+        last_month = numpy.datetime64(hi // _DAY, 'D').astype('datetime64[M]')
+        last_period = int((last_month - first_month).astype(int)) // step
+        months = first_month + \
+            numpy.arange(periods(last_period)).astype('timedelta64[M]') * step
+        firsts = months.astype('datetime64[D]')
+        lengths = ((months + 1).astype('datetime64[D]') - firsts).astype(int)
+        firsts = firsts[day < lengths].astype(numpy.int64)
+        candidates = (firsts + day) * _DAY + dtstart % _DAY
+
+    candidates = candidates[(candidates >= dtstart) & (candidates <= hi)]
+    if count:
+        candidates = candidates[:count]
+    return candidates
+
+
+def recurrence_array(dtstart, rules, tzinfo, rdates=(), exdates=(), hi=None):
+    """Vectorized iter_recurrence() for simple rules (see rrule_array()).
+
+    Args:
+        dtstart (int): wall time of the first occurrence
+        rules (list): RRULE values
+        tzinfo (tzinfo): time zone of dtstart
+        rdates (iterable): wall times of additional occurrences
+        exdates (iterable): wall times of excluded occurrences
+        hi (int): upper bound (included) of the wall times to expand,
+            may only be None if the rules are finite
+
+    Returns:
+        numpy.ndarray: the sorted and unique wall times of the
+        occurrences, or None if a rule is not simple
+    """
+    if hi is None:
+        hi = numpy.iinfo(numpy.int64).max // 2
+    arrays = [numpy.array([dtstart] + list(rdates), dtype=numpy.int64)]
+    for value in rules:
+        array = rrule_array(value, dtstart, tzinfo, hi)
+        if array is None:
+            return None
+        arrays.append(array)
+    walls = numpy.unique(numpy.concatenate(arrays))
+    if exdates:
+        excluded = numpy.array(list(exdates), dtype=numpy.int64)
+        walls = walls[~numpy.isin(walls, excluded)]
+    return walls[walls <= hi]
+
+
+def utc_offsets(walls, tzinfo):
+    """Vectorized utils.utc_offset().
+
+    The offset is computed once per day, and for each wall time of the
+    days during which it changes.
+
+    Args:
+        walls (numpy.ndarray): wall times
+        tzinfo (tzinfo)
+
+    Returns:
+        numpy.ndarray: the offsets (in microseconds) at `walls`
+    """
+    days, inverse = numpy.unique(walls // _DAY, return_inverse=True)
+    day_offsets = numpy.zeros(len(days), dtype=numpy.int64)
+    changing = numpy.zeros(len(days), dtype=bool)
+    for i, day in enumerate(days.tolist()):
+        offset = utc_offset(day * _DAY, tzinfo)
+        if offset == utc_offset((day + 1) * _DAY, tzinfo):
+            day_offsets[i] = offset
+        else:
+            changing[i] = True
+
+    offsets = day_offsets[inverse.ravel()]
+    for i in numpy.nonzero(changing[inverse.ravel()])[0]:
+        offsets[i] = utc_offset(int(walls[i]), tzinfo)
+    return offsets
@@ -19,6 +19,7 @@ from .utils import (
     get_arrow,
     arrow_to_iso,
     uid_gen,
+    compact_arrow,
 )
 from .parse import ContentLine, Container
 
@@ -50,6 +51,11 @@ class Todo(Component):
     _EXTRACTORS = []
     _OUTPUTS = []
 
+    # Instants are stored compactly and converted to Arrow on access
+    _due = compact_arrow('_due')
+    _completed = compact_arrow('_completed')
+    created = compact_arrow('_created')
+
     def __init__(self,
                  name=None,
                  #begin=None,
@@ -112,6 +118,16 @@ class Todo(Component):
         elif duration:  # Duration was specified
             self.duration = duration
 
+    @property
+    def uid(self):
+        """Get or set the unique identifier of the todo."""
+        return self._uid
+
+    @uid.setter
+    def uid(self, value):
+        self._uid = value
+        self._changed('_uid_version')
+
     def has_due(self):
         """
         Return:
@@ -414,14 +430,15 @@ class Todo(Component):
         """
         Returns:
             int: hash of self. Based on self.uid."""
-        ord3 = lambda x: '%.3d' % ord(x)
-        return int(''.join(map(ord3, self.uid)))
+        # Strings cache their hash: it is computed once per uid value
+        return hash(self.uid)
 
 
 ######################
 ####### Inputs #######
 
-@Todo._extracts('DTSTAMP')
+@Todo._extracts('DTSTAMP',
+                lazy_attrs=('_created_epoch', '_created_tz'))
 def created(todo, line):
     if line:
         # get the dict of vtimezones passed to the classmethod
@@ -434,7 +451,8 @@ def percent(todo, line):
     todo.percent = line.value if line else None
 
 
-@Todo._extracts('COMPLETED')
+@Todo._extracts('COMPLETED',
+                lazy_attrs=('_completed_epoch', '_completed_tz'))
 def completed(todo, line):
     if line:
         # get the dict of vtimezones passed to the classmethod
@@ -451,7 +469,7 @@ def completed(todo, line):
         #todo._begin_precision = iso_precision(line.value)
 
 
-@Todo._extracts('DURATION')
+@Todo._extracts('DURATION', lazy_attrs=('_duration',))
 def duration(todo, line):
     if line:
         #TODO: DRY [1]
@@ -460,7 +478,7 @@ def duration(todo, line):
         todo._duration = parse_duration(line.value)
 
 
-@Todo._extracts('DUE')
+@Todo._extracts('DUE', lazy_attrs=('_due_epoch', '_due_tz'))
 def due(todo, line):
     if line:
         #TODO: DRY [1]
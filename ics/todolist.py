@@ -10,7 +10,7 @@ from six.moves import filter, map, range
 from arrow.arrow import Arrow
 import arrow
 
-from .utils import get_arrow
+from .utils import get_arrow, revision
 from .todo import Todo
 
 
@@ -31,6 +31,10 @@ class TodoList(list):
         """
 
         super(TodoList, self).__init__()
+        # Changed by the todos of self when their uid changes
+        self._uid_version = 0
+        self._uids = None
+        self._uids_version = None
 
         for elem in arg:
             if not isinstance(elem, Todo):
@@ -248,13 +252,71 @@ or None not '{}'".format(sl.step))
         return catlist
 
 
+    def _get_uids(self):
+        """Returns a dict: uid -> position of the first todo with this
+        uid, (re)building it if the list or the uid of a todo changed."""
+        uids = getattr(self, '_uids', None)
+        version = getattr(self, '_uid_version', 0)
+        if uids is None or self._uids_version != version:
+            uids = {}
+            for position, todo in enumerate(self):
+                uids.setdefault(todo.uid, position)
+            self._uids = uids
+            self._uids_version = version
+        return uids
+
+    def get(self, uid, default=None):
+        """Returns the first todo with the given `uid`, in O(1).
+
+        Returns:
+            Todo: or `default` if no todo has this `uid`
+        """
+        position = self._get_uids().get(uid)
+        if position is None:
+            return default
+        return super(TodoList, self).__getitem__(position)
+
+    def __contains__(self, item):
+        """`item` may be a todo or an uid: todos are equal if they
+        have the same uid."""
+        if isinstance(item, Todo):
+            return item.uid in self._get_uids()
+        elif isinstance(item, string_types):
+            return item in self._get_uids()
+        return super(TodoList, self).__contains__(item)
+
+    def update(self, other):
+        """Merges the todos of `other` into self, in a single pass.
+
+        Todos with a new uid are appended. Otherwise, the most recent
+        version (see :func:`ics.utils.revision`) of the todo replaces the
+        first todo with this uid, the one of `other` in case of a tie.
+
+        Raises:
+            ValueError: if `other` contains elements which are not\
+            :class:`ics.todo.Todo`
+        """
+        uids = self._get_uids()
+        for todo in other:
+            if not isinstance(todo, Todo):
+                raise ValueError('TodoList may only contain elements of type "Todo" not {}'
+                    .format(type(todo)))
+            position = uids.get(todo.uid)
+            if position is None:
+                self.append(todo)  # Adds its uid to `uids`
+            elif revision(todo) >= revision(self[position]):
+                super(TodoList, self).__setitem__(position, todo)
+                todo._watch(self)
+
     def _remove_duplicates(self):
-        seen = set()
-        for i in reversed(range(len(self))):
-            if self[i] in seen:
-                del self[i]
-            else:
-                seen.add(self[i])
+        # Keeps the last of the equal todos, rebuilding the list at once
+        seen, kept = set(), []
+        for todo in reversed(self):
+            if todo not in seen:
+                seen.add(todo)
+                kept.append(todo)
+        kept.reverse()
+        self[:] = kept
 
     def __add__(self, *args, **kwargs):
         """Add 2 :class:`ics.todolist.TodoList`.
@@ -293,11 +355,62 @@ or None not '{}'".format(sl.step))
             raise ValueError('TodoList may only contain elements of type "Todo" not {}'
                 .format(type(val)))
         super(TodoList, self).__setitem__(key, val)
+        for elem in (val if isinstance(key, slice) else (val,)):
+            elem._watch(self)
+        self._invalidate_uids()
 
     def __setslice__(self, i, j, val):
         """Compatibility for python2"""
         return self.__setitem__(slice(i, j), val)
 
+    def _invalidate_uids(self):
+        self._uids = None
+
+    def __delitem__(self, key):
+        super(TodoList, self).__delitem__(key)
+        self._invalidate_uids()
+
+    def __delslice__(self, i, j):
+        """Compatibility for python2"""
+        return self.__delitem__(slice(i, j))
+
+    def __iadd__(self, other):
+        self.extend(other)
+        return self
+
+    def extend(self, iterable):
+        """Append each element of `iterable`, see :meth:`append`."""
+        for elem in iterable:
+            self.append(elem)
+
+    def insert(self, i, elem):
+        if not isinstance(elem, Todo):
+            raise ValueError('TodoList may only contain elements of type "Todo" not {}'
+                .format(type(elem)))
+        super(TodoList, self).insert(i, elem)
+        elem._watch(self)
+        self._invalidate_uids()
+
+    def pop(self, *args):
+        elem = super(TodoList, self).pop(*args)
+        self._invalidate_uids()
+        return elem
+
+    def remove(self, elem):
+        super(TodoList, self).remove(elem)
+        self._invalidate_uids()
+
+    def clear(self):
+        del self[:]
+
+    def sort(self, *args, **kwargs):
+        super(TodoList, self).sort(*args, **kwargs)
+        self._invalidate_uids()
+
+    def reverse(self):
+        super(TodoList, self).reverse()
+        self._invalidate_uids()
+
     def append(self, elem):
         """Append a element to self and verifies that it's an :class:`ics.todo.Todo`.
 
@@ -310,3 +423,7 @@ or None not '{}'".format(sl.step))
             raise ValueError('TodoList may only contain elements of type "Todo" not {}'
                 .format(type(elem)))
         super(TodoList, self).append(elem)
+        elem._watch(self)
+        uids = getattr(self, '_uids', None)
+        if uids is not None:
+            uids.setdefault(elem.uid, len(self) - 1)
@@ -12,9 +12,99 @@ tzutc = arrow.utcnow().tzinfo
 from uuid import uuid4
 
 import re
+import collections
+import threading
 
 from . import parse
-from datetime import timedelta
+from datetime import datetime, timedelta
+
+
+CacheInfo = collections.namedtuple(
+    'CacheInfo',
+    ['hits', 'misses', 'maxsize', 'currsize']
+)
+
+
+class LRUCache(object):
+
+    """A bounded and thread-safe mapping which evicts its least
+    recently used entries.
+
+    Only immutable values should be stored as they are shared
+    between every caller.
+    """
+
+    def __init__(self, maxsize=4096):
+        """Args:
+            maxsize (int): maximum number of entries, 0 disables the cache
+        """
+        self._data = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def maxsize(self):
+        """Get or set the maximum number of entries.
+
+        |  Setting a lower value evicts the oldest entries.
+        """
+        return self._maxsize
+
+    @maxsize.setter
+    def maxsize(self, value):
+        with self._lock:
+            self._maxsize = value
+            self._evict()
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value = self._data.pop(key)
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data[key] = value  # Move to the most recently used end
+            self.hits += 1
+            return value
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = value
+            self._evict()
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+    def _evict(self):
+        while len(self._data) > self._maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self):
+        """Removes every entry and resets the counters."""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self):
+        """
+        Returns:
+            CacheInfo: hits, misses, maxsize and current size of the cache
+        """
+        return CacheInfo(self.hits, self.misses, self._maxsize, len(self))
+
+
+# Caches of the conversions of DATE/DATE-TIME values (iso_to_arrow) and of
+# their precision (iso_precision). Arrow objects are immutable so a
+# cached instant can safely be returned to many events.
+datetime_cache = LRUCache()
+precision_cache = LRUCache()
 
 
 def remove_x(container):
@@ -36,11 +126,33 @@ def iso_to_arrow(time_container, available_tz={}):
         tz = tz_list[0]
     else:
         tz = None
-    if (not 'T' in time_container.value) and \
-            'DATE' in time_container.params.get('VALUE', []):
-        val = time_container.value + 'T0000'
+    value = time_container.value
+    is_date = 'DATE' in time_container.params.get('VALUE', [])
+
+    # The same TZID may be bound to another tzinfo by another calendar:
+    # the tzinfo is part of the key and checked on hit, as its id() may
+    # have been reused by another object
+    tzinfo = available_tz.get(tz) if tz else None
+    key = (value, tz, is_date, id(tzinfo))
+    cached = datetime_cache.get(key)
+    if cached is not None and cached[0] is tzinfo:
+        return cached[1]
+
+    instant = _iso_to_arrow(value, tz, is_date, available_tz)
+    datetime_cache[key] = (tzinfo, instant)
+    return instant
+
+
+def _iso_to_arrow(value, tz, is_date, available_tz):
+    instant = ical_to_arrow(value, tz, available_tz)
+    if instant is not None:
+        return instant
+
+    # Not a rfc5545 value: let arrow guess the format
+    if (not 'T' in value) and is_date:
+        val = value + 'T0000'
     else:
-        val = time_container.value
+        val = value
 
     if tz and not (val[-1].upper() == 'Z'):
         naive = arrow.get(val).naive
@@ -53,7 +165,54 @@ def iso_to_arrow(time_container, available_tz={}):
     # http://www.kanzaki.com/docs/ical/dateTime.html)
 
 
+def ical_to_arrow(value, tz=None, available_tz={}):
+    """Parses the fixed formats of rfc5545 DATE and DATE-TIME values:
+    YYYYMMDD, YYYYMMDDTHHMMSS and YYYYMMDDTHHMMSSZ.
+
+    Args:
+        value (string)
+        tz (string): TZID of the value, ignored for UTC (...Z) values
+        available_tz (dict): TZID -> tzinfo, unknown TZIDs fallback to UTC
+
+    Returns:
+        Arrow: the instant or None if `value` has another format
+    """
+    length = len(value)
+    if length == 8:
+        time = '000000'
+    elif (length == 15 or length == 16) and value[8] == 'T':
+        time = value[9:15]
+    else:
+        return None
+
+    if length == 16:
+        if value[15] not in 'Zz':
+            return None
+        tzinfo = tzutc
+    elif tz:
+        tzinfo = available_tz.get(tz, tzutc)
+    else:
+        tzinfo = tzutc
+
+    if not (value[:8].isdigit() and time.isdigit()):
+        return None
+    try:
+        return Arrow(int(value[:4]), int(value[4:6]), int(value[6:8]),
+                     int(time[:2]), int(time[2:4]), int(time[4:6]),
+                     tzinfo=tzinfo)
+    except ValueError:  # Out of range field, like a 13th month
+        return None
+
+
 def iso_precision(string):
+    precision = precision_cache.get(string)
+    if precision is None:
+        precision = _iso_precision(string)
+        precision_cache[string] = precision
+    return precision
+
+
+def _iso_precision(string):
     has_time = 'T' in string
 
     if has_time:
@@ -155,12 +314,110 @@ def get_arrow(value):
         return arrow.get(value)
 
 
+def revision(component):
+    """Returns a key ordering the versions of a component (with the same
+    uid): its SEQUENCE (0 if missing or invalid), then its LAST-MODIFIED
+    (or DTSTAMP) timestamp."""
+    sequence, modified = 0, None
+    for line in component._unused:
+        if line.name == 'SEQUENCE':
+            try:
+                sequence = int(line.value)
+            except ValueError:
+                sequence = 0
+        elif line.name == 'LAST-MODIFIED':
+            modified = iso_to_arrow(line)
+    if modified is None:
+        modified = component.created
+    return sequence, modified.float_timestamp if modified else float('-inf')
+
+
 def arrow_to_iso(instant):
     # set to utc, make iso, remove timezone
     instant = arrow.get(instant.astimezone(tzutc)).format('YYYYMMDDTHHmmss')
     return instant + 'Z'
 
 
+# Compact storage of instants: an Arrow is kept as the number of
+# microseconds between the epoch and its wall clock time, plus its tzinfo.
+_EPOCH = datetime(1970, 1, 1)
+tz_cache = LRUCache(maxsize=256)
+
+
+def intern_tz(tzinfo):
+    """Returns a shared tzinfo equal to `tzinfo`, so that equal time zones
+    are only stored once."""
+    key = tzinfo
+    try:
+        hash(key)
+    except TypeError:  # Most dateutil time zones are not hashable
+        key = (type(tzinfo), repr(tzinfo))
+    cached = tz_cache.get(key)
+    if cached is not None and (cached is tzinfo or cached == tzinfo):
+        return cached
+    tz_cache[key] = tzinfo
+    return tzinfo
+
+
+def arrow_to_epoch(instant):
+    """Returns a (microseconds, tzinfo) tuple representing `instant`,
+    or (None, None) if `instant` is None."""
+    instant = get_arrow(instant)
+    if instant is None:
+        return None, None
+    return naive_to_epoch(instant.naive), intern_tz(instant.tzinfo)
+
+
+def naive_to_epoch(naive):
+    """Returns the number of microseconds between the epoch and the naive
+    datetime `naive`."""
+    delta = naive - _EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds
+
+
+def epoch_to_arrow(microseconds, tzinfo):
+    """Reverse of arrow_to_epoch()."""
+    if microseconds is None:
+        return None
+    naive = _EPOCH + timedelta(microseconds=microseconds)
+    return Arrow.fromdatetime(naive, tzinfo)
+
+
+def epoch_to_timestamp(microseconds, tzinfo):
+    """Returns the same value as
+    epoch_to_arrow(microseconds, tzinfo).float_timestamp, faster."""
+    naive = _EPOCH + timedelta(microseconds=microseconds)
+    offset = tzinfo.utcoffset(naive.replace(tzinfo=tzinfo))
+    seconds = microseconds // 1000000 - offset.days * 86400 - offset.seconds
+    return seconds + float(naive.microsecond) / 1000000
+
+
+def utc_offset(microseconds, tzinfo):
+    """Returns the offset of `tzinfo` at the wall time `microseconds`
+    (see arrow_to_epoch()), in microseconds."""
+    naive = _EPOCH + timedelta(microseconds=microseconds)
+    offset = tzinfo.utcoffset(naive.replace(tzinfo=tzinfo))
+    return (offset.days * 86400 + offset.seconds) * 1000000
+
+
+def compact_arrow(attr):
+    """Returns a property storing an Arrow with arrow_to_epoch() in the
+    `attr`_epoch and `attr`_tz attributes. The Arrow is built on access.
+    """
+    epoch_attr, tz_attr = attr + '_epoch', attr + '_tz'
+
+    def getter(self):
+        return epoch_to_arrow(getattr(self, epoch_attr),
+                              getattr(self, tz_attr))
+
+    def setter(self, value):
+        epoch, tzinfo = arrow_to_epoch(value)
+        setattr(self, epoch_attr, epoch)
+        setattr(self, tz_attr, tzinfo)
+
+    return property(getter, setter)
+
+
 def uid_gen():
     uid = str(uuid4())
     return "{}@{}.org".format(uid, uid[:4])
@@ -60,6 +60,12 @@ setup(
         "arrow",
         "six",
     ],
+    extras_require={
+        # EventList.expand_array()
+        'numpy': ["numpy"],
+        # Calendar.from_file(workers=...) on python 2
+        'futures': ['futures; python_version < "3"'],
+    },
     license=__license__,
     packages=['ics'],
     include_package_data=True,
@@ -1,11 +1,13 @@
 import unittest
+import os
 from collections import Iterable
-from six import PY2
+from six import PY2, StringIO
 import arrow
 
-from ics.parse import Container
+from ics.parse import Container, ContentLine
 
-from ics.icalendar import Calendar
+from ics.icalendar import (Calendar, vtimezone_cache, ProcessPoolExecutor,
+                            load_many)
 from ics.event import Event
 from ics.eventlist import EventList
 
@@ -60,6 +62,22 @@ class TestCalendar(unittest.TestCase):
             i_with_no_lr = map(lambda x: x.rstrip('\n'), c)
             self.assertSequenceEqual(s.split('\n'), list(i_with_no_lr))
 
+    def test_iter_lines(self):
+        c = Calendar(cal1)
+        c.events[0].description = ' '.join(['Lorem ipsum'] * 20)
+        lines = list(c.iter_lines())
+        for line in lines:
+            self.assertTrue(line.endswith('\r\n'))
+            self.assertTrue(len(line) <= 77)
+        self.assertEqual(str(c), str(Calendar(''.join(lines))))
+
+    def test_dump(self):
+        c = Calendar(cal1)
+        f = StringIO()
+        c.dump(f)
+        self.assertEqual(''.join(c.iter_lines()), f.getvalue())
+        self.assertEqual(c, Calendar(f.getvalue()))
+
     def test_eventlist_is_same(self):
         c = Calendar()
         l = EventList()
@@ -204,8 +222,26 @@ class TestCalendar(unittest.TestCase):
 
     def test_multiple_calendars(self):
 
-        with self.assertRaises(NotImplementedError):
-            Calendar() + Calendar()
+        c = Calendar() + Calendar()
+        self.assertEqual(0, len(c.events))
+
+    def test_merge(self):
+        c0, c1 = Calendar(cal1), Calendar(cal14)
+        newer = c0.events[0].clone()
+        newer.name = 'newer'
+        newer._unused.append(ContentLine('SEQUENCE', value='4'))
+        c2 = Calendar(events=[newer, Event(name='other')])
+
+        merged = Calendar.merge(iter([c0, c1, c2]))
+        self.assertEqual(len(c1.events) + 2, len(merged.events))
+        self.assertIs(newer, merged.events[0])
+        self.assertEqual(['other'], [e.name for e in merged.events[-1:]])
+        self.assertTrue(c0._timezones)
+        self.assertEqual(c0._timezones, merged._timezones)
+        self.assertEqual(len(c0.events), 1)
+
+        merged = c0 + c2
+        self.assertEqual(['newer', 'other'], [e.name for e in merged.events])
 
     def test_init_int(self):
 
@@ -219,6 +255,82 @@ class TestCalendar(unittest.TestCase):
         with self.assertRaises(ValueError):
             c.events = e
 
+    def test_iter_events(self):
+        path = os.path.join(os.path.dirname(__file__), "fixtures",
+                            "timezoned.ics")
+        events = list(Calendar.iter_events(path))
+        self.assertEqual(1, len(events))
+        self.assertEqual(arrow.get(2012, 2, 13, 9), events[0].begin)
+
+        with open(path) as f:
+            c = Calendar(f.read())
+        self.assertSequenceEqual(c.events, events)
+        self.assertEqual(c.events[0].begin, events[0].begin)
+        self.assertEqual(c.events[0].end, events[0].end)
+
+    def test_from_file(self):
+        path = os.path.join(os.path.dirname(__file__), "fixtures",
+                            "case_meetup.ics")
+        c = Calendar.from_file(path)
+        self.assertEqual(3, len(c.events))
+
+    @unittest.skipIf(ProcessPoolExecutor is None, 'requires futures')
+    def test_from_file_workers(self):
+        path = os.path.join(os.path.dirname(__file__), "fixtures",
+                            "case_meetup.ics")
+        expected = Calendar.from_file(path)
+        for lazy in (False, True):
+            c = Calendar.from_file(path, workers=2, lazy=lazy)
+            self.assertEqual(expected.events, c.events)
+            self.assertEqual([e.begin for e in expected.events],
+                             [e.begin for e in c.events])
+            tzinfo = c._timezones['America/New_York']
+            self.assertTrue(all(e.begin.tzinfo is tzinfo for e in c.events))
+
+    def _load_many(self, executor=None):
+        fixtures = os.path.join(os.path.dirname(__file__), "fixtures")
+        paths = [os.path.join(fixtures, name) for name in
+                 ("case_meetup.ics", "time.ics", "missing.ics",
+                  "timezoned.ics")]
+        stats = {}
+        results = dict(load_many(paths, executor=executor, stats=stats))
+        self.assertEqual(set(paths), set(results))
+        self.assertEqual(3, len(results[paths[0]].events))
+        self.assertIsInstance(results[paths[1]], ValueError)  # No PRODID
+        self.assertIsInstance(results[paths[2]], (IOError, OSError))
+        tzinfo = results[paths[3]]._timezones['Europe/Vienna']
+        self.assertIs(tzinfo, results[paths[3]].events[0].begin.tzinfo)
+        self.assertEqual((4, 2), (stats['files'], stats['errors']))
+        self.assertGreater(stats['bytes'], 0)
+
+    def test_load_many(self):
+        self._load_many()
+
+    @unittest.skipIf(ProcessPoolExecutor is None, 'requires futures')
+    def test_load_many_executors(self):
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(2) as executor:
+            self._load_many(executor)
+        with ProcessPoolExecutor(2) as executor:
+            self._load_many(executor)
+
+    def test_vtimezone_cache(self):
+        vtimezone_cache.clear()
+        c0 = Calendar(cal1)
+        c1 = Calendar(cal1)
+        self.assertEqual(1, len(vtimezone_cache))
+        self.assertEqual(1, vtimezone_cache.hits)
+        tz = c0._timezones['Europe/Brussels']
+        self.assertIs(tz, c1._timezones['Europe/Brussels'])
+        self.assertEqual(c0.events[0].begin, c1.events[0].begin)
+
+        # Calendars get their own registry
+        self.assertIsNot(c0._timezones, c1._timezones)
+
+        vtimezone_cache.clear()
+        c2 = Calendar(cal1)
+        self.assertIsNot(tz, c2._timezones['Europe/Brussels'])
+
     def test_imports(self):
         c = Calendar(cal1)
         self.assertEqual(c.creator, '-//Apple Inc.//Mac OS X 10.9//EN')
@@ -89,6 +89,39 @@ class TestComponent(unittest.TestCase):
         self.assertEqual(c.some_attr, "anything")
         self.assertEqual(unused, c._unused)
 
+    def test_unused_keeps_order(self):
+        cont = Container("TEST")
+        cont.append(ContentLine(name="PLOP", value="plip"))
+        cont.append(ContentLine(name="ATTR", value="anything"))
+        cont.append(ContentLine(name="PLIP", value="plop"))
+        cont.append(ContentLine(name="PLOP", value="plup"))
+
+        unused = Container("TEST")
+        unused.append(ContentLine(name="PLOP", value="plip"))
+        unused.append(ContentLine(name="PLIP", value="plop"))
+        unused.append(ContentLine(name="PLOP", value="plup"))
+
+        c = CT1._from_container(cont)
+        self.assertEqual(c.some_attr, "anything")
+        self.assertEqual(unused, c._unused)
+
+    def test_extractor_registered_later(self):
+        class CT5(ComponentBaseTest):
+            _OUTPUTS, _EXTRACTORS = [], []
+
+        CT5._from_container(Container("TEST"))
+
+        @CT5._extracts('ATTR')
+        def attr5(test, line):
+            if line:
+                test.some_attr = line.value
+
+        cont = Container("TEST")
+        cont.append(ContentLine(name="ATTR", value="anything"))
+        c = CT5._from_container(cont)
+        self.assertEqual(c.some_attr, "anything")
+        self.assertEqual(Container("TEST"), c._unused)
+
     def test_required_raises(self):
         cont = Container("TEST")
         cont.append(ContentLine(name="PLOP", value="plip"))
@@ -28,6 +28,12 @@ class TestContentLine(unittest.TestCase):
             {'TZID': ['Europe/Brussels']},
             '20131029T103000'
         ),
+        'DTSTART;TZID="America/New_York:x":20131029T103000':
+        ContentLine(
+            'DTSTART',
+            {'TZID': ['America/New_York:x']},
+            '20131029T103000'
+        ),
     }
 
     dataset2 = {
@@ -43,11 +49,27 @@ class TestContentLine(unittest.TestCase):
             {'hoho': ['p1', 'p2'], 'hihi': ['p3', 'p4', 'p5']},
             'blabla:blublu'
         ),
+        'ATTENDEE;DELEGATED-TO="mailto:a@b.c","mailto:d@e.f";ROLE=CHAIR:x':
+        ContentLine(
+            'ATTENDEE',
+            {'DELEGATED-TO': ['mailto:a@b.c', 'mailto:d@e.f'],
+             'ROLE': ['CHAIR']},
+            'x'
+        ),
+        'haha;p1="a;b",c;p2="":v':
+        ContentLine(
+            'haha',
+            {'p1': ['a;b', 'c'], 'p2': ['']},
+            'v'
+        ),
     }
 
     def test_errors(self):
         self.assertRaises(ParseError, ContentLine.parse, 'haha;p1=v1')
         self.assertRaises(ParseError, ContentLine.parse, 'haha;p1:')
+        self.assertRaises(ParseError, ContentLine.parse, 'haha;p1="v1:')
+        self.assertRaises(ParseError, ContentLine.parse, 'haha;p1="v:1"')
+        self.assertRaises(ParseError, ContentLine.parse, 'haha;p1="v"1:x')
 
     def test_str(self):
         for test in self.dataset:
@@ -1,10 +1,11 @@
 import unittest
+import os
 from datetime import timedelta
 import arrow
 from ics.event import Event
 from ics.icalendar import Calendar
 from ics.parse import Container
-from .fixture import cal12, cal13
+from .fixture import cal1, cal12, cal13
 
 
 class TestEvent(unittest.TestCase):
@@ -45,6 +46,115 @@ class TestEvent(unittest.TestCase):
         with self.assertRaises(ValueError):
             Calendar(cal13)
 
+    def test_lazy(self):
+        e = Calendar(cal12, lazy=True).events[0]
+        self.assertEqual('Name', e.name)
+        self.assertNotIn('_begin_epoch', e.__dict__)
+        self.assertNotIn('_duration', e.__dict__)
+
+        eager = Calendar(cal12).events[0]
+        self.assertEqual(eager.begin, e.begin)
+        self.assertNotIn('_duration', e.__dict__)
+        self.assertEqual(eager.end, e.end)
+        self.assertEqual(eager.duration, e.duration)
+        self.assertEqual(eager._begin_precision, e._begin_precision)
+
+    def test_lazy_end_and_duration(self):
+        # The error is only raised when the DTEND line is read
+        e = Calendar(cal13, lazy=True).events[0]
+        self.assertEqual('Name', e.name)
+        with self.assertRaises(ValueError):
+            e._end_time
+
+    def test_lazy_output(self):
+        c = Calendar(cal1, lazy=True)
+        e = c.events[0]
+        self.assertIs(e._raw, e._to_container())
+        e.begin  # Reading does not change the output
+        self.assertIs(e._raw, e._to_container())
+
+        e.end = e.end.replace(hours=+1)
+        self.assertIsNot(e._raw, e._to_container())
+        self.assertEqual(e.end, Calendar(str(c)).events[0].end)
+
+    def test_lazy_set_before_read(self):
+        e = Calendar(cal12, lazy=True).events[0]
+        e.created = arrow.get(2000, 1, 1)
+        self.assertEqual(arrow.get(2000, 1, 1), e.created)
+        self.assertIn('DTSTAMP:20000101T000000Z', str(e))
+        self.assertEqual(Calendar(cal12).events[0].begin, e.begin)
+        self.assertEqual(arrow.get(2000, 1, 1), e.created)
+
+    def test_lazy_clone(self):
+        e = Calendar(cal12, lazy=True).events[0]
+        clone = e.clone()
+        self.assertEqual(e.begin, clone.begin)
+        self.assertEqual(e.end, clone.end)
+
+    def test_compact_storage(self):
+        e = Event(begin=0, end=20, created=10)
+        self.assertFalse(any(isinstance(value, arrow.Arrow)
+                             for value in vars(e).values()))
+        self.assertEqual(arrow.get(10), e.created)
+        self.assertEqual((0, 20), e._timestamps())
+        e.duration = timedelta(seconds=30)
+        self.assertEqual((0, 30), e._timestamps())
+
+    def test_occurrences(self):
+        path = os.path.join(os.path.dirname(__file__), "fixtures",
+                            "recurrence.ics")
+        with open(path) as f:
+            e = Calendar(f.read()).events[0]
+        self.assertTrue(e.is_recurring())
+
+        occurrences = list(e.occurrences())
+        self.assertEqual(97, len(occurrences))  # 100 - 3 EXDATE
+        self.assertEqual([arrow.get(1996, 4, 1, 1), arrow.get(1996, 4, 5, 1)],
+                         [o.begin for o in occurrences[:2]])
+        self.assertEqual(arrow.get(1996, 7, 9, 2), occurrences[-1].end)
+        self.assertTrue(all(o == e and not o.is_recurring()
+                            for o in occurrences))
+
+        window = e.occurrences('1996-04-02T12:00', '1996-04-07T01:30')
+        self.assertEqual([5, 6, 7], [o.begin.day for o in window])
+
+        # The recurrence is kept in the output
+        e2 = Calendar(str(Calendar(events=[e]))).events[0]
+        self.assertEqual(97, len(list(e2.occurrences())))
+
+    def test_occurrences_infinite(self):
+        e = Event(begin=arrow.get(2014, 1, 1), duration=timedelta(hours=1))
+        self.assertEqual([e], list(e.occurrences()))
+        self.assertEqual([], list(e.occurrences('2014-02-01')))
+
+        e._rrules = ('FREQ=WEEKLY',)
+        window = e.occurrences('2014-02-01', '2014-03-01')
+        self.assertEqual([5, 12, 19, 26], [o.begin.day for o in window])
+        later = next(e.occurrences('2114-01-01'))
+        self.assertEqual(arrow.get(2114, 1, 3), later.begin)
+        self.assertEqual(arrow.get(2114, 1, 3, 1), later.end)
+
+    def test_occurrences_cache_invalidation(self):
+        e = Event(begin=arrow.get(2014, 1, 1), duration=timedelta(hours=1))
+        e._rrules = ('FREQ=WEEKLY',)
+        window = ('2014-02-01', '2014-03-01')
+        self.assertEqual(4, len(list(e.occurrences(*window))))
+
+        e._rrules = ('FREQ=DAILY',)
+        self.assertEqual(29, len(list(e.occurrences(*window))))
+        e._exdates = (arrow.get(2014, 2, 2),)
+        self.assertEqual(28, len(list(e.occurrences(*window))))
+        e.begin = arrow.get(2014, 2, 20)
+        self.assertEqual(10, len(list(e.occurrences(*window))))
+
+    def test_hash(self):
+        e0, e1 = Event(uid='a@example.org'), Event(uid='a@example.org')
+        self.assertEqual(hash(e0), hash(e1))
+        self.assertEqual(1, len(set([e0, e1])))
+        e1.uid = 'b@example.org'
+        self.assertNotEqual(hash(e0), hash(e1))
+        self.assertEqual(2, len(set([e0, e1])))
+
     def test_duration_output(self):
         e = Event(begin=0, duration=timedelta(1, 23))
         lines = str(e).split('\n')
@@ -1,8 +1,9 @@
 import unittest
 import arrow
-from ics.eventlist import EventList
+from ics.eventlist import EventList, _IntervalIndex, iter_conflicts, numpy
 from ics.event import Event
 from ics.icalendar import Calendar
+from ics.parse import ContentLine
 from .fixture import cal1
 
 
@@ -260,3 +261,266 @@ class TestEventList(unittest.TestCase):
         l = EventList([Event(), Event()])
         with self.assertRaises(ValueError):
             l[3] = "plop"
+
+    def test_index_append(self):
+
+        l = EventList()
+        t = arrow.now()
+
+        e0 = Event(begin=t.replace(hours=-1), end=t.replace(hours=+1))
+        l.append(e0)
+        self.assertEqual([e0], l[t.replace(hours=-2):t.replace(hours=+2)])
+
+        e1 = Event(begin=t.replace(minutes=-30), end=t.replace(minutes=+30))
+        l.append(e1)
+        self.assertEqual([e0, e1], l[t.replace(hours=-2):t.replace(hours=+2)])
+        self.assertEqual([e0, e1], l.at(t))
+
+    def test_index_delete(self):
+
+        t = arrow.now()
+        e0 = Event(begin=t.replace(hours=-1), end=t.replace(hours=+1))
+        e1 = Event(begin=t.replace(minutes=-30), end=t.replace(minutes=+30))
+        l = EventList([e0, e1])
+        self.assertEqual([e0, e1], l.at(t))
+
+        del l[0]
+        self.assertEqual([e1], l.at(t))
+        l[0] = e0
+        self.assertEqual([e0], l.at(t))
+        l.clear()
+        self.assertEqual([], l.at(t))
+
+    def test_index_event_changed(self):
+
+        t = arrow.now()
+        e = Event(begin=t.replace(hours=-1), end=t.replace(hours=+1))
+        l = EventList([e])
+        self.assertEqual([e], l.at(t))
+
+        e.end = t.replace(minutes=-1)
+        self.assertEqual([], l.at(t))
+
+    def test_index_other_event_changed(self):
+
+        t = arrow.now()
+        e = Event(begin=t.replace(hours=-1), end=t.replace(hours=+1))
+        l0, l1 = EventList([e]), EventList([e])
+        self.assertEqual([e], l0.at(t))
+        self.assertEqual([e], l1.at(t))
+        index = l0._get_index()
+
+        other = Event(begin=t, end=t.replace(hours=+1))
+        other.begin = t.replace(hours=-2)
+        self.assertIs(index, l0._get_index())
+
+        e.begin = t.replace(minutes=+1)
+        self.assertEqual([], l0.at(t))
+        self.assertEqual([], l1.at(t))
+        self.assertEqual([], e.clone().__dict__.get('_lists', []))
+
+    def test_index_many(self):
+
+        t = arrow.get(2014, 1, 1)
+        l = EventList()
+        for i in range(500):
+            l.append(Event(name=str(i), begin=t.replace(hours=i),
+                           end=t.replace(hours=i + 2)))
+        l.reverse()
+
+        got = l[t.replace(hours=100):t.replace(hours=105):'any']
+        self.assertEqual(['104', '103', '102', '101', '100', '99'],
+                         [e.name for e in got])
+        got = l[t.replace(hours=100):t.replace(hours=105):'both']
+        self.assertEqual(['102', '101'], [e.name for e in got])
+        got = l[t.replace(hours=100, minutes=30):t.replace(hours=101):'inc']
+        self.assertEqual(['100'], [e.name for e in got])
+        self.assertEqual(['101', '100', '99'],
+                         [e.name for e in l.at(t.replace(hours=101))])
+
+    def test_recurring(self):
+        t = arrow.get(2014, 1, 1)
+        e0 = Event(name='once', begin=t.replace(days=+3, hours=+12),
+                   end=t.replace(days=+3, hours=+13))
+        e1 = Event(name='daily', begin=t, end=t.replace(hours=+1))
+        e1._rrules = ('FREQ=DAILY;COUNT=10',)
+        l = EventList([e1, e0])
+
+        got = l[t.replace(days=+2):t.replace(days=+4)]
+        self.assertEqual(['daily', 'once'], [e.name for e in got])
+        self.assertEqual([t.replace(days=+3), e0.begin],
+                         [e.begin for e in got])
+        got = l[t.replace(days=+2):t.replace(days=+4):'any']
+        self.assertEqual(['daily', 'daily', 'once'],
+                         [e.name for e in got])
+        self.assertEqual([], l[t.replace(days=+20):t.replace(days=+30)])
+        self.assertEqual(10, len(l[t:]))
+
+        got = l.at(t.replace(days=+5, minutes=+30))
+        self.assertEqual([t.replace(days=+5)], [e.begin for e in got])
+
+    def test_recurring_infinite(self):
+        t = arrow.get(2014, 1, 1)
+        e = Event(begin=t, end=t.replace(hours=+1))
+        e._rrules = ('FREQ=WEEKLY',)
+        l = EventList([e])
+        l.append(Event(begin=t, end=t.replace(hours=+1)))
+
+        got = l.at(t.replace(weeks=+50, minutes=+1))
+        self.assertEqual([t.replace(weeks=+50)], [e.begin for e in got])
+        self.assertEqual(2, len(l.concurrent(l[1])))
+        with self.assertRaises(ValueError):
+            l[t:]
+
+    def test_uid_index(self):
+        e0, e1 = Event(uid='a@example.org'), Event(uid='b@example.org')
+        l = EventList([e0, e1])
+        self.assertIs(e1, l.get('b@example.org'))
+        self.assertIsNone(l.get('c@example.org'))
+        self.assertIn('a@example.org', l)
+        self.assertIn(Event(uid='a@example.org'), l)
+        self.assertNotIn('c@example.org', l)
+
+        e2 = Event(uid='c@example.org')
+        l.append(e2)
+        self.assertIs(e2, l.get('c@example.org'))
+        uids = l._get_uids()
+        Event(uid='e@example.org').uid = 'f@example.org'
+        self.assertIs(uids, l._get_uids())  # Not in l
+        e2.uid = 'd@example.org'
+        self.assertNotIn('c@example.org', l)
+        self.assertIs(e2, l.get('d@example.org'))
+        del l[0]
+        self.assertIsNone(l.get('a@example.org'))
+        self.assertIs(e2, l.get('d@example.org'))
+
+    def test_update(self):
+        t = arrow.get(2014, 1, 1)
+        old = Calendar(cal1).events[0]
+        new = old.clone()
+        new.begin = old.begin.replace(hours=+1)
+        new._unused.append(ContentLine('SEQUENCE', value='4'))  # Was 3
+        other = Event(begin=t, end=t.replace(hours=+1))
+        l = EventList([old])
+        self.assertEqual([old], l.at(old.begin))
+
+        l.update([new, other])
+        self.assertEqual(2, len(l))
+        self.assertIs(new, l[0])
+        self.assertEqual([other], l.at(t))
+        self.assertEqual([new], l.at(new.begin))
+        l.update([old])  # Older version
+        self.assertIs(new, l[0])
+        with self.assertRaises(ValueError):
+            l.update(['plop'])
+
+    def test_update_invalid_sequence(self):
+        old = Calendar(cal1).events[0]
+        new = old.clone()
+        new._unused.append(ContentLine('SEQUENCE', value='x'))  # Taken as 0
+        l = EventList([old])
+        l.update([new])
+        self.assertIs(old, l[0])
+        l = EventList([new])
+        l.update([old])
+        self.assertIs(old, l[0])
+
+    def test_conflicts(self):
+        t = arrow.get(2014, 1, 1)
+        e0 = Event(name='e0', begin=t, end=t.replace(hours=+2))
+        e1 = Event(name='e1', begin=t.replace(hours=+1),
+                   end=t.replace(hours=+3))
+        e2 = Event(name='e2', begin=t.replace(hours=+2),
+                   end=t.replace(hours=+4))  # Touches e0
+        e3 = Event(name='e3', begin=t.replace(hours=+5),
+                   end=t.replace(hours=+6))
+        e4 = Event(name='e4', begin=t.replace(hours=+1, minutes=+30),
+                   duration={'hours': 1})
+        l = EventList([e3, e2, Event(), e1, e0, e4])
+
+        got = [(a.name, b.name) for a, b in l.conflicts()]
+        self.assertEqual([('e0', 'e1'), ('e0', 'e4'), ('e1', 'e4'),
+                          ('e1', 'e2'), ('e4', 'e2')], got)
+        for a, b in l.conflicts():
+            self.assertIn(b, l.concurrent(a))
+        got = l.conflicts(t.replace(hours=+3), t.replace(hours=+6))
+        self.assertEqual([], got)
+
+        e5 = Event(name='e5', begin=t.replace(hours=+5, minutes=+30),
+                   duration={'minutes': 10})
+        e5._rrules = ('FREQ=DAILY;COUNT=3',)
+        l.append(e5)
+        got = l.conflicts(t.replace(hours=+4))
+        self.assertEqual([(e3, e5.begin)], [(a, b.begin) for a, b in got])
+
+    def test_iter_conflicts(self):
+        t = arrow.get(2014, 1, 1)
+        events = [Event(begin=t.replace(hours=i), duration={'hours': 2})
+                  for i in range(4)]
+        pairs = iter_conflicts(iter(events))
+        self.assertEqual((events[0], events[1]), next(pairs))
+        self.assertEqual([(events[1], events[2]), (events[2], events[3])],
+                         list(pairs))
+        with self.assertRaises(ValueError):
+            list(iter_conflicts(reversed(events)))
+
+    @unittest.skipIf(numpy is None, 'requires numpy')
+    def test_columns(self):
+        t = arrow.get(2014, 1, 1)
+        e0 = Event(begin=t.to('Europe/Paris'), end=t.replace(hours=+1))
+        e1 = Event(begin=t.replace(days=+1))
+        e1._rrules = ('FREQ=DAILY',)
+        l = EventList([e0, Event(), e1])
+
+        c = l.columns()
+        us = 1000000 * t.timestamp
+        self.assertEqual([us, 0, us + 86400 * 1000000], c.begin.tolist())
+        self.assertEqual([us + 3600 * 1000000, 0, us + 86401 * 1000000],
+                         c.end.tolist())
+        self.assertEqual([True, False, True], c.has_begin.tolist())
+        self.assertEqual([False, False, True], c.recurring.tolist())
+        self.assertIs(c, l.columns())
+
+        e0.end = t.replace(hours=+2)
+        self.assertEqual(us + 7200 * 1000000, l.columns().end[0])
+        l.append(Event(begin=t))
+        self.assertEqual(4, len(l.columns().begin))
+        del l[0]
+        self.assertEqual([0, us + 86400 * 1000000, us],
+                         l.columns().begin.tolist())
+
+    @unittest.skipIf(numpy is None, 'requires numpy')
+    def test_index_from_columns(self):
+        t = arrow.get(2014, 1, 1)
+        l = EventList([Event(begin=t.replace(hours=i % 7),
+                             end=t.replace(hours=i % 7 + i % 3))
+                       for i in range(50)])
+        l.append(Event())
+        l[3]._rrules = ('FREQ=DAILY',)
+        expected = _IntervalIndex(l)
+        index = _IntervalIndex.from_columns(l.columns())
+        self.assertEqual(vars(expected), vars(index))
+
+    @unittest.skipIf(numpy is None, 'requires numpy')
+    def test_expand_array(self):
+        t = arrow.get(2014, 1, 1)
+        e0 = Event(name='once', begin=t.replace(days=+3, hours=+12),
+                   end=t.replace(days=+3, hours=+13))
+        e1 = Event(name='daily', begin=t, end=t.replace(hours=+1))
+        e1._rrules = ('FREQ=DAILY;COUNT=10',)
+        e2 = Event(name='complex', begin=t, end=t.replace(hours=+1))
+        e2._rrules = ('FREQ=MONTHLY;BYDAY=1MO',)
+        l = EventList([e1, e0, Event(), e2])
+
+        start, stop = t.replace(days=+2), t.replace(days=+10)
+        got = l.expand_array(start, stop)
+        expected = [(i, o.begin, o.end) for i, e in enumerate(l)
+                    for o in e.occurrences(start, stop)]
+        self.assertEqual([row[0] for row in expected], got.index.tolist())
+        self.assertEqual([row[1].naive for row in expected],
+                         got.begin.astype(object).tolist())
+        self.assertEqual([row[2].naive for row in expected],
+                         got.end.astype(object).tolist())
+
+        with self.assertRaises(ValueError):
+            l.expand_array(start)
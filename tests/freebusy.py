@@ -0,0 +1,115 @@
+import unittest
+from datetime import timedelta
+import arrow
+from ics.event import Event
+from ics.eventlist import EventList
+from ics.freebusy import FreeBusy, merge_periods, find_free_slots
+from ics.icalendar import Calendar
+from ics.parse import string_to_container
+
+
+class TestFreeBusy(unittest.TestCase):
+
+    def test_merge_periods(self):
+        periods = [(0, 2), (1, 3), (3, 4), (6, 7), (6, 6), (8, 9)]
+        self.assertEqual([(0, 4), (6, 7), (8, 9)],
+                         list(merge_periods(periods)))
+        self.assertEqual([], list(merge_periods([])))
+
+    def test_eventlist_freebusy(self):
+        t = arrow.get(2014, 1, 1)
+        e0 = Event(begin=t.replace(hours=+9), end=t.replace(hours=+10))
+        e1 = Event(begin=t.replace(hours=+9, minutes=+30),
+                   end=t.replace(hours=+11))
+        e2 = Event(begin=t.replace(hours=+13, minutes=+10),
+                   duration={'minutes': 5})
+        e3 = Event(begin=t.replace(hours=+7), duration={'hours': 1})
+        e3._rrules = ('FREQ=DAILY',)
+        l = EventList([e2, e1, Event(), e0, e3])
+
+        fb = l.freebusy(t.replace(hours=+9), t.replace(days=+1, hours=+9))
+        self.assertEqual([(t.replace(hours=+9), t.replace(hours=+11)),
+                          (t.replace(hours=+13, minutes=+10),
+                           t.replace(hours=+13, minutes=+15)),
+                          (t.replace(days=+1, hours=+7),
+                           t.replace(days=+1, hours=+8))], fb.periods)
+
+        fb = l.freebusy(t.replace(hours=+10), t.replace(hours=+14),
+                        granularity=timedelta(minutes=30))
+        self.assertEqual([(t.replace(hours=+10), t.replace(hours=+11)),
+                          (t.replace(hours=+13), t.replace(hours=+13,
+                                                           minutes=+30))],
+                         fb.periods)
+
+    def test_output(self):
+        t = arrow.get(2014, 1, 1)
+        fb = FreeBusy(begin=t, end=t.replace(days=+1), created=t,
+                      uid='fb@example.org',
+                      periods=[(t.replace(hours=+1), t.replace(hours=+2))])
+        lines = str(fb).split('\n')
+        self.assertEqual('BEGIN:VFREEBUSY', lines[0])
+        self.assertIn('DTSTART:20140101T000000Z', lines)
+        self.assertIn('FREEBUSY:20140101T010000Z/20140101T020000Z', lines)
+
+        parsed = FreeBusy._from_container(string_to_container(str(fb))[0])
+        self.assertEqual(fb.periods, parsed.periods)
+        self.assertEqual((fb.begin, fb.end, fb.uid),
+                         (parsed.begin, parsed.end, parsed.uid))
+
+    def test_parse_periods(self):
+        container = string_to_container('\n'.join([
+            'BEGIN:VFREEBUSY',
+            'FREEBUSY:20140101T010000Z/PT1H,20140101T030000Z/20140101T040000Z',
+            'FREEBUSY;FBTYPE=FREE:20140101T050000Z/PT1H',
+            'END:VFREEBUSY']))[0]
+        fb = FreeBusy._from_container(container)
+        t = arrow.get(2014, 1, 1)
+        self.assertEqual([(t.replace(hours=+1), t.replace(hours=+2)),
+                          (t.replace(hours=+3), t.replace(hours=+4))],
+                         fb.periods)
+
+    def test_find_free_slots(self):
+        t = arrow.get(2014, 1, 6)  # A monday
+        c0 = EventList([
+            Event(begin=t.replace(hours=+9), end=t.replace(hours=+10)),
+            Event(begin=t.replace(hours=+11), end=t.replace(hours=+12))])
+        c1 = Calendar()
+        c1.events.append(Event(begin=t.replace(hours=+9, minutes=+30),
+                               end=t.replace(hours=+10, minutes=+15)))
+        window = (t, t.replace(days=+2))
+        hour = timedelta(hours=1)
+
+        self.assertEqual([(t, t.replace(hours=+9))],
+                         find_free_slots([c0, c1], hour, window))
+        working_hours = [(t.replace(days=+i, hours=+9),
+                          t.replace(days=+i, hours=+17)) for i in range(2)]
+        slots = find_free_slots([c0, c1], timedelta(minutes=30), window,
+                                working_hours, limit=3)
+        self.assertEqual([(t.replace(hours=+10, minutes=+15),
+                           t.replace(hours=+11)),
+                          (t.replace(hours=+12), t.replace(hours=+17)),
+                          (t.replace(days=+1, hours=+9),
+                           t.replace(days=+1, hours=+17))], slots)
+        slots = find_free_slots([c0, c1], hour, window, working_hours,
+                                limit=None)
+        self.assertEqual(2, len(slots))
+        self.assertEqual([], find_free_slots([c0], hour,
+                                             (t.replace(hours=+9),
+                                              t.replace(hours=+10))))
+
+    def test_busy_periods_lazy(self):
+        t = arrow.get(2014, 1, 1)
+        daily = Event(begin=t.replace(hours=+2), end=t.replace(hours=+3))
+        daily._rrules = ('FREQ=DAILY',)
+        l = EventList([daily] + [
+            Event(begin=t.replace(days=+i), end=t.replace(days=+i, hours=+1))
+            for i in range(100)])
+        l.at(t)  # Builds the index
+        l.append(Event(begin=t.replace(hours=+1), end=t.replace(hours=+2)))
+
+        periods = l._busy_periods(t, t.replace(days=+1000))
+        ms = 3600 * 1000000
+        start = int(t.float_timestamp * 1000000)
+        self.assertEqual((start, start + 3 * ms), next(periods))
+        self.assertEqual((start + 24 * ms, start + 25 * ms), next(periods))
+        self.assertEqual((start + 26 * ms, start + 27 * ms), next(periods))
@@ -0,0 +1,182 @@
+import unittest
+import io
+import os
+import shutil
+import tempfile
+
+import arrow
+
+from ics.event import Event
+from ics.icalendar import Calendar
+from ics.index import Index, LazyEventList, MISSING, build, default_path
+from ics.todo import Todo
+
+
+def _calendar_text():
+    lines = ['BEGIN:VCALENDAR', 'VERSION:2.0', 'PRODID:tests']
+    for i in range(200):
+        day = 1 + i % 28
+        lines += ['BEGIN:VEVENT', 'UID:event-{}'.format(i),
+                  'DTSTART:201401{:02d}T{:02d}0000Z'.format(day, i % 20),
+                  'DTEND:201401{:02d}T{:02d}0000Z'.format(
+                      min(28, day + i % 3), i % 20 + 1 + i % 4),
+                  'END:VEVENT']
+    lines += ['BEGIN:VEVENT', 'UID:recurring', 'DTSTART:20140101T100000Z',
+              'DTEND:20140101T110000Z', 'RRULE:FREQ=DAILY;COUNT=20',
+              'END:VEVENT',
+              'BEGIN:VEVENT', 'UID:no-begin', 'END:VEVENT',
+              'BEGIN:VTODO', 'UID:event-3', 'END:VTODO',
+              'END:VCALENDAR']
+    return '\r\n'.join(lines) + '\r\n'
+
+
+def _key(events):
+    return sorted((e.uid, e.begin, e.end) for e in events)
+
+
+class TestIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'calendar.ics')
+        fixtures = os.path.join(os.path.dirname(__file__), "fixtures")
+        with io.open(os.path.join(fixtures, "case_meetup.ics"),
+                     encoding='utf-8') as fileobj:
+            text = fileobj.read()
+        # Add a todo without due date after the events
+        todo = 'BEGIN:VTODO\r\nUID:todo-1\r\nSUMMARY:todo\r\nEND:VTODO\r\n'
+        text = text.replace('END:VCALENDAR', todo + 'END:VCALENDAR')
+        with io.open(self.path, 'w', encoding='utf-8') as fileobj:
+            fileobj.write(text)
+        self.calendar = Calendar(text)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_build(self):
+        index_path = build(self.path)
+        self.assertEqual(default_path(self.path), index_path)
+        with Index(self.path) as index:
+            self.assertEqual(4, len(index))
+            self.assertEqual([0, 0, 0, 1], list(index.types))
+            # The calendar stores its components in reverse order
+            events = list(reversed(self.calendar.events))
+            for position, event in enumerate(events):
+                self.assertEqual(event.uid, index.uid(position))
+                self.assertEqual(
+                    int(event.begin.float_timestamp * 1000000),
+                    index.begins[position])
+                self.assertEqual(
+                    int(event.end.float_timestamp * 1000000),
+                    index.ends[position])
+            self.assertEqual('todo-1', index.uid(3))
+            self.assertEqual(MISSING, index.begins[3])
+            self.assertEqual(MISSING, index.ends[3])
+
+    def test_component(self):
+        build(self.path)
+        events = list(reversed(self.calendar.events))
+        for lazy in (False, True):
+            with Index(self.path, lazy=lazy) as index:
+                for position, event in enumerate(events):
+                    component = index.component(position)
+                    self.assertIsInstance(component, Event)
+                    self.assertEqual(event.uid, component.uid)
+                    self.assertEqual(event.begin, component.begin)
+                    self.assertIs(index.timezones['America/New_York'],
+                                  component.begin.tzinfo)
+                self.assertIsInstance(index.component(3), Todo)
+
+    def test_get(self):
+        build(self.path)
+        with Index(self.path) as index:
+            for event in self.calendar.events:
+                self.assertEqual(event.uid, index.get(event.uid).uid)
+            self.assertEqual(3, index.position('todo-1'))
+            self.assertIsNone(index.position('missing'))
+            self.assertIsNone(index.get('missing'))
+            self.assertEqual(0, index.get('missing', 0))
+
+    def test_outdated(self):
+        build(self.path)
+        with io.open(self.path, 'ab') as fileobj:
+            fileobj.write(b'\r\n')
+        self.assertRaises(ValueError, Index, self.path)
+        with io.open(default_path(self.path), 'r+b') as fileobj:
+            fileobj.write(b'NOTINDEX')
+        self.assertRaises(ValueError, Index, self.path)
+
+    def test_empty(self):
+        with io.open(self.path, 'wb'):
+            pass
+        build(self.path)
+        with Index(self.path) as index:
+            self.assertEqual(0, len(index))
+            self.assertIsNone(index.get('missing'))
+
+
+class TestLazyEventList(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'calendar.ics')
+        text = _calendar_text()
+        with io.open(self.path, 'wb') as fileobj:
+            fileobj.write(text.encode('utf-8'))
+        self.events = Calendar(text).events
+        build(self.path)
+        self.index = Index(self.path)
+        self.lazy = LazyEventList(self.index, maxsize=16)
+
+    def tearDown(self):
+        self.index.close()
+        shutil.rmtree(self.directory)
+
+    def test_sequence(self):
+        self.assertEqual(202, len(self.lazy))
+        self.assertEqual('event-0', self.lazy[0].uid)
+        self.assertEqual('no-begin', self.lazy[-1].uid)
+        self.assertEqual(['event-1', 'event-3'],
+                         [e.uid for e in self.lazy[1:5:2]])
+        self.lazy.cache.clear()
+        self.assertEqual(_key(self.events), _key(self.lazy))
+        self.assertEqual(0, len(self.lazy.cache))  # Not kept by iteration
+
+    def test_cache(self):
+        self.assertIs(self.lazy[0], self.lazy[0])
+        for i in range(100):
+            self.lazy[i]
+        self.assertEqual(16, len(self.lazy.cache))
+
+    def test_slices(self):
+        t = arrow.get(2014, 1, 1)
+        windows = [(t.replace(days=+2), t.replace(days=+5)),
+                   (t.replace(days=+10, hours=+3), t.replace(days=+10,
+                                                             hours=+9)),
+                   (t.replace(days=+27), t.replace(days=+40)),
+                   (None, t.replace(days=+3)),
+                   (t.replace(days=+20), None)]
+        for start, stop in windows:
+            for step in ('begin', 'end', 'both', 'any', 'inc'):
+                self.assertEqual(_key(self.events[start:stop:step]),
+                                 _key(self.lazy[start:stop:step]))
+        day = t.replace(days=+4)
+        self.assertEqual(_key(self.events[day]), _key(self.lazy[day]))
+        self.assertEqual(_key(self.events.on(day)), _key(self.lazy.on(day)))
+        self.assertRaises(ValueError, self.lazy.__getitem__,
+                          slice(t, None, 'middle'))
+
+    def test_at(self):
+        t = arrow.get(2014, 1, 1)
+        for instant in (t.replace(days=+3, hours=+3), t.replace(days=+10),
+                        t.replace(hours=+10, minutes=+30), t):
+            self.assertEqual(_key(self.events.at(instant)),
+                             _key(self.lazy.at(instant)))
+
+    def test_get(self):
+        self.assertEqual('event-3', self.lazy.get('event-3').uid)
+        self.assertIsInstance(self.lazy.get('event-3'), Event)
+        self.assertIsNone(self.lazy.get('missing'))
+        self.assertIn('recurring', self.lazy)
+        self.assertIn(self.events[0], self.lazy)
+        self.assertNotIn('missing', self.lazy)
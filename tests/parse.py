@@ -1,4 +1,6 @@
 import unittest
+import mmap
+from six import StringIO
 
 from .fixture import cal1, cal5, cal11
 from ics.event import Event
@@ -9,6 +11,10 @@ from ics.parse import (
     Container,
     string_to_container,
     lines_to_container,
+    bytes_to_container,
+    iter_unfolded_bytes,
+    unfold_lines,
+    iter_components,
 )
 
 
@@ -53,6 +59,42 @@ class TestParse(unittest.TestCase):
                     vehicula nullam.', line.value)
             i += 1
 
+    def test_iter_components(self):
+        # A tiny chunk size forces lines to be split across chunks
+        components = list(iter_components(StringIO(cal1), chunk_size=7))
+        self.assertEqual(['VTIMEZONE', 'VEVENT'],
+                         [c.name for c in components])
+        expected = [c for c in string_to_container(cal1)[0]
+                    if isinstance(c, Container)]
+        self.assertEqual([str(c) for c in expected],
+                         [str(c) for c in components])
+
+    def test_bytes_to_container(self):
+        for cal in (cal1, cal5):
+            data = cal.encode('utf-8')
+            mapped = mmap.mmap(-1, len(data))
+            mapped.write(data)
+            expected = [str(c) for c in string_to_container(cal)]
+            for source in (data, bytearray(data), mapped):
+                self.assertEqual(expected,
+                                 [str(c) for c in bytes_to_container(source)])
+            mapped.close()
+            # A tiny chunk size forces lines to be split across chunks
+            self.assertEqual(
+                list(unfold_lines(cal.split('\n'))),
+                [line.decode('utf-8')
+                 for line in iter_unfolded_bytes(data, chunk_size=7)])
+
+        data = b'X:0\r\nBEGIN:A\r\nSUMMARY:caf\xc3\r\n \xa9\r\n\r\nEND:A\r\nX:1'
+        container = bytes_to_container(data, 5, len(data) - 3)[0]
+        self.assertEqual('A', container.name)
+        # The octets of a character may be folded on two lines
+        self.assertEqual(u'caf\xe9', container[0].value)
+
+        c = Calendar(bytearray(cal1.encode('utf-8')))
+        self.assertEqual([str(e) for e in Calendar(cal1).events],
+                         [str(e) for e in c.events])
+
     def test_end_different(self):
 
         with self.assertRaises(ParseError):
@@ -0,0 +1,153 @@
+import unittest
+from itertools import takewhile
+from datetime import datetime
+from dateutil.tz import gettz
+from dateutil.rrule import rrule, DAILY
+from ics.recurrence import (
+    parse_rrule,
+    is_finite,
+    iter_recurrence,
+    expand_window,
+    occurrence_cache,
+    rrule_array,
+    recurrence_array,
+    utc_offsets,
+    numpy,
+)
+from ics.utils import naive_to_epoch, utc_offset
+
+
+class TestRecurrence(unittest.TestCase):
+
+    def test_parse_rrule(self):
+        rule = parse_rrule('FREQ=WEEKLY;COUNT=3', datetime(2014, 1, 1, 10),
+                           gettz('Europe/Brussels'))
+        self.assertEqual([datetime(2014, 1, 1, 10), datetime(2014, 1, 8, 10),
+                          datetime(2014, 1, 15, 10)], list(rule))
+
+    def test_parse_rrule_utc_until(self):
+        # 09:00 UTC is 10:00 in Brussels: the bound is included
+        rule = parse_rrule('FREQ=DAILY;UNTIL=20140103T090000Z',
+                           datetime(2014, 1, 1, 10), gettz('Europe/Brussels'))
+        self.assertEqual(3, len(list(rule)))
+
+    def test_parse_rrule_invalid(self):
+        with self.assertRaises(ValueError):
+            parse_rrule('FREQ=SOMETIMES', datetime(2014, 1, 1), None)
+
+    def test_is_finite(self):
+        self.assertTrue(is_finite([]))
+        self.assertTrue(is_finite(['FREQ=DAILY;COUNT=2',
+                                   'FREQ=DAILY;UNTIL=20140101']))
+        self.assertFalse(is_finite(['FREQ=DAILY;COUNT=2', 'FREQ=DAILY']))
+
+    def test_iter_recurrence(self):
+        start = datetime(2014, 1, 1)
+        days = rrule(DAILY, dtstart=start, count=5)
+        every_other_day = rrule(DAILY, interval=2, dtstart=start)
+        got = iter_recurrence(
+            start, [days, every_other_day],
+            rdates=[datetime(2014, 1, 4), datetime(2014, 1, 6, 12)],
+            exdates=[datetime(2014, 1, 2), datetime(2014, 1, 7)])
+        expected = [datetime(2014, 1, day) for day in (1, 3, 4, 5)]
+        expected += [datetime(2014, 1, 6, 12), datetime(2014, 1, 9),
+                     datetime(2014, 1, 11)]
+        self.assertEqual(expected, [next(got) for i in range(7)])
+
+    def test_iter_recurrence_dtstart(self):
+        # DTSTART is always the first occurrence, even if it is not
+        # an occurrence of the rule
+        start = datetime(2014, 1, 1)
+        weekly = rrule(DAILY, dtstart=start, count=2, byweekday=0)
+        self.assertEqual([start, datetime(2014, 1, 6), datetime(2014, 1, 13)],
+                         list(iter_recurrence(start, [weekly])))
+
+
+class TestExpandWindow(unittest.TestCase):
+
+    def setUp(self):
+        occurrence_cache.clear()
+        self.calls = 0
+
+    def factory(self):
+        self.calls += 1
+        return iter(rrule(DAILY, dtstart=datetime(2014, 1, 1), count=30))
+
+    def expand(self, lo, hi, key='key'):
+        return [dt.day for dt in expand_window(
+            key, self.factory, datetime(2014, 1, lo), datetime(2014, 1, hi))]
+
+    def test_hit(self):
+        self.assertEqual([3, 4, 5], self.expand(3, 5))
+        self.assertEqual([4, 5], self.expand(4, 5))
+        self.assertEqual(1, self.calls)
+
+    def test_merge(self):
+        self.assertEqual([3, 4, 5], self.expand(3, 5))
+        self.assertEqual([10, 11], self.expand(10, 11))
+        self.assertEqual([5, 6, 7, 8, 9, 10], self.expand(5, 10))
+        self.assertEqual(3, self.calls)
+        segments = occurrence_cache.get('key')[1]
+        self.assertEqual([(datetime(2014, 1, 3), datetime(2014, 1, 11))],
+                         [segment[:2] for segment in segments])
+        self.assertEqual(list(range(3, 12)),
+                         [dt.day for dt in segments[0][2]])
+
+        self.assertEqual(list(range(2, 13)), self.expand(2, 12))
+        self.assertEqual([1, 2], self.expand(1, 2, key='other'))
+        self.assertEqual(5, self.calls)
+
+    def test_unbounded(self):
+        self.assertEqual(30, len(expand_window('key', self.factory)))
+        self.assertEqual(30, len(expand_window('key', self.factory)))
+        self.assertEqual(1, self.calls)
+
+
+@unittest.skipIf(numpy is None, 'requires numpy')
+class TestRecurrenceArray(unittest.TestCase):
+
+    rules = [
+        'FREQ=DAILY;COUNT=10',
+        'FREQ=DAILY;INTERVAL=3;BYDAY=MO,SA',
+        'FREQ=WEEKLY;INTERVAL=2;BYDAY=TU,TH,SU',
+        'FREQ=WEEKLY;UNTIL=20150601T080000Z',
+        'FREQ=MONTHLY;COUNT=20',
+        'FREQ=YEARLY',
+    ]
+
+    def test_same_as_rrule(self):
+        tzinfo = gettz('Europe/Brussels')
+        hi = datetime(2020, 1, 1)
+        for dtstart in (datetime(2014, 1, 31, 10), datetime(2012, 2, 29, 10),
+                        datetime(2014, 3, 30, 2, 30)):
+            for value in self.rules:
+                rule = parse_rrule(value, dtstart, tzinfo)
+                expected = [naive_to_epoch(dt) for dt in
+                            takewhile(lambda dt: dt <= hi, rule)]
+                got = rrule_array(value, naive_to_epoch(dtstart), tzinfo,
+                                  naive_to_epoch(hi))
+                self.assertEqual(expected, got.tolist(), value)
+
+    def test_not_simple(self):
+        self.assertIsNone(rrule_array('FREQ=MONTHLY;BYDAY=1MO', 0, None, 0))
+        self.assertIsNone(rrule_array('FREQ=HOURLY', 0, None, 0))
+        self.assertIsNone(recurrence_array(
+            0, ['FREQ=DAILY', 'FREQ=YEARLY;BYMONTH=1'], None, hi=0))
+
+    def test_recurrence_array(self):
+        start = datetime(2014, 1, 1)
+        got = recurrence_array(
+            naive_to_epoch(start), ['FREQ=DAILY;COUNT=5'], None,
+            rdates=[naive_to_epoch(datetime(2014, 1, 9))],
+            exdates=[naive_to_epoch(datetime(2014, 1, 2))])
+        self.assertEqual([1, 3, 4, 5, 9], [
+            (datetime(1970, 1, 1) + (wall * numpy.timedelta64(1, 'us'))
+             .astype(object)).day for wall in got.tolist()])
+
+    def test_utc_offsets(self):
+        tzinfo = gettz('Europe/Brussels')
+        walls = numpy.array([naive_to_epoch(datetime(2014, 3, 30, hour))
+                             for hour in range(24)] +
+                            [naive_to_epoch(datetime(2014, 7, 1))])
+        self.assertEqual([utc_offset(wall, tzinfo) for wall in walls.tolist()],
+                         utc_offsets(walls, tzinfo).tolist())
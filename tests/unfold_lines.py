@@ -1,5 +1,5 @@
 import unittest
-from ics.parse import unfold_lines
+from ics.parse import unfold_lines, fold_line
 from .fixture import (
     cal1,
     cal2,
@@ -64,3 +64,21 @@ class TestUnfoldLines(unittest.TestCase):
     def test_first_line_empty(self):
         self.assertEqual(list(unfold_lines(cal9.split('\n'))),
                          ['BEGIN:VCALENDAR', 'END:VCALENDAR'])
+
+
+class TestFoldLine(unittest.TestCase):
+
+    def test_short(self):
+        self.assertEqual(['a' * 75], fold_line('a' * 75))
+
+    def test_long(self):
+        folded = fold_line('a' * 200)
+        self.assertEqual(['a' * 75, ' ' + 'a' * 74, ' ' + 'a' * 51], folded)
+        self.assertEqual(['a' * 200], list(unfold_lines(folded)))
+
+    def test_multibyte(self):
+        line = 'DESCRIPTION:' + '\u00e9' * 100
+        folded = fold_line(line)
+        for physical_line in folded:
+            self.assertTrue(len(physical_line.encode('utf-8')) <= 75)
+        self.assertEqual([line], list(unfold_lines(folded)))
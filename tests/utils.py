@@ -1,7 +1,23 @@
 import unittest
 from datetime import timedelta
-from ics.parse import ParseError, Container, string_to_container
-from ics.utils import parse_duration, timedelta_to_duration, remove_x, iso_to_arrow
+import arrow
+from dateutil.tz import gettz
+from ics.parse import ParseError, Container, ContentLine, string_to_container
+from ics.utils import (
+    parse_duration,
+    timedelta_to_duration,
+    remove_x,
+    iso_to_arrow,
+    ical_to_arrow,
+    iso_precision,
+    LRUCache,
+    datetime_cache,
+    precision_cache,
+    arrow_to_epoch,
+    epoch_to_arrow,
+    epoch_to_timestamp,
+    intern_tz,
+)
 
 from tests.fixture import cal1, cal2
 
@@ -83,3 +99,139 @@ class TestIso_to_arrow(unittest.TestCase):
 
     def test_none(self):
         self.assertIs(None, iso_to_arrow(None))
+
+    def test_date(self):
+        line = ContentLine('DTSTART', {'VALUE': ['DATE']}, '20131029')
+        self.assertEqual(arrow.get(2013, 10, 29), iso_to_arrow(line))
+        line = ContentLine('DTSTART', {}, '20131029')
+        self.assertEqual(arrow.get(2013, 10, 29), iso_to_arrow(line))
+
+    def test_utc(self):
+        line = ContentLine('DTSTAMP', {}, '20131024T204741Z')
+        self.assertEqual(arrow.get(2013, 10, 24, 20, 47, 41),
+                         iso_to_arrow(line))
+
+    def test_floating(self):
+        line = ContentLine('DTSTART', {}, '20131029T103000')
+        self.assertEqual(arrow.get(2013, 10, 29, 10, 30), iso_to_arrow(line))
+
+    def test_tzid(self):
+        tz = gettz('Europe/Brussels')
+        line = ContentLine('DTSTART', {'TZID': ['Europe/Brussels']},
+                           '20131029T103000')
+        got = iso_to_arrow(line, {'Europe/Brussels': tz})
+        self.assertEqual(arrow.get(2013, 10, 29, 9, 30), got)
+        self.assertIs(tz, got.tzinfo)
+
+        # Unknown timezones fallback to UTC
+        self.assertEqual(arrow.get(2013, 10, 29, 10, 30), iso_to_arrow(line))
+
+        # UTC values ignore TZID
+        line.value = '20131029T103000Z'
+        self.assertEqual(arrow.get(2013, 10, 29, 10, 30),
+                         iso_to_arrow(line, {'Europe/Brussels': tz}))
+
+    def test_other_formats(self):
+        line = ContentLine('DTSTART', {}, '2013-10-29T10:30')
+        self.assertEqual(arrow.get(2013, 10, 29, 10, 30), iso_to_arrow(line))
+
+
+class TestIcal_to_arrow(unittest.TestCase):
+
+    def test_not_ical(self):
+        for value in ('2013-10-29', '20131029T1030', '20131029T103000+0100',
+                      '20131029X103000', '20131329T103000', 'a0131029'):
+            self.assertIs(None, ical_to_arrow(value), value)
+
+
+class TestLRUCache(unittest.TestCase):
+
+    def test_evict(self):
+        cache = LRUCache(maxsize=2)
+        cache['a'] = 1
+        cache['b'] = 2
+        self.assertEqual(1, cache.get('a'))  # 'b' is now the oldest
+        cache['c'] = 3
+        self.assertNotIn('b', cache)
+        self.assertIn('a', cache)
+        self.assertIn('c', cache)
+        self.assertEqual(2, len(cache))
+
+    def test_counters(self):
+        cache = LRUCache()
+        cache['a'] = 1
+        cache.get('a')
+        cache.get('a')
+        cache.get('b')
+        self.assertEqual((2, 1, 4096, 1), cache.info())
+        cache.clear()
+        self.assertEqual((0, 0, 4096, 0), cache.info())
+
+    def test_resize(self):
+        cache = LRUCache(maxsize=3)
+        for i in range(3):
+            cache[i] = i
+        cache.maxsize = 1
+        self.assertEqual(1, len(cache))
+        self.assertIn(2, cache)
+
+    def test_disabled(self):
+        cache = LRUCache(maxsize=0)
+        cache['a'] = 1
+        self.assertIs(None, cache.get('a'))
+
+
+class TestDatetimeCache(unittest.TestCase):
+
+    def setUp(self):
+        datetime_cache.clear()
+        precision_cache.clear()
+
+    def test_hit(self):
+        line = ContentLine('DTSTAMP', {}, '20131024T204741Z')
+        first = iso_to_arrow(line)
+        self.assertIs(first, iso_to_arrow(line))
+        self.assertEqual(1, datetime_cache.hits)
+        self.assertEqual(1, datetime_cache.misses)
+
+    def test_tz_registry(self):
+        line = ContentLine('DTSTART', {'TZID': ['Europe/Brussels']},
+                           '20131029T103000')
+        in_utc = iso_to_arrow(line, {})
+        tz = gettz('Europe/Brussels')
+        in_brussels = iso_to_arrow(line, {'Europe/Brussels': tz})
+        self.assertNotEqual(in_utc, in_brussels)
+        self.assertIs(tz, in_brussels.tzinfo)
+        self.assertEqual(2, datetime_cache.misses)
+
+    def test_precision(self):
+        self.assertEqual('second', iso_precision('20131029T103000'))
+        self.assertEqual('second', iso_precision('20131029T103000'))
+        self.assertEqual('day', iso_precision('20131029'))
+        self.assertEqual(1, precision_cache.hits)
+
+
+class TestEpoch(unittest.TestCase):
+
+    def test_roundtrip(self):
+        berlin = gettz('Europe/Berlin')
+        for instant in (arrow.get(0),
+                        arrow.get('2013-10-29T10:30:00.123456+02:00'),
+                        arrow.Arrow(1950, 3, 30, 2, 30, tzinfo=berlin)):
+            epoch, tzinfo = arrow_to_epoch(instant)
+            back = epoch_to_arrow(epoch, tzinfo)
+            self.assertEqual(instant, back)
+            self.assertEqual(instant.naive, back.naive)
+            self.assertEqual(instant.float_timestamp,
+                             epoch_to_timestamp(epoch, tzinfo))
+
+    def test_none(self):
+        self.assertEqual((None, None), arrow_to_epoch(None))
+        self.assertIsNone(epoch_to_arrow(None, None))
+
+    def test_intern_tz(self):
+        self.assertIs(arrow_to_epoch(arrow.now())[1],
+                      arrow_to_epoch(arrow.now())[1])
+        berlin = gettz('Europe/Berlin')
+        self.assertIs(berlin, intern_tz(berlin))
+        self.assertIsNot(berlin, intern_tz(gettz('Europe/Brussels')))